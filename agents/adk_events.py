@@ -0,0 +1,28 @@
+"""
+Helpers for reading text out of ADK runner events.
+Shared by the agents that stream model output in SSE mode.
+"""
+from typing import Any, AsyncIterator
+
+def event_text(event: Any) -> str:
+    """Concatenate the text parts of a single ADK event."""
+    content = getattr(event, 'content', None)
+    if not content or not getattr(content, 'parts', None):
+        return ""
+    return "".join(part.text for part in content.parts if getattr(part, 'text', None))
+
+async def iter_sse_text(events: AsyncIterator[Any]) -> AsyncIterator[str]:
+    """Yield each piece of text from an SSE-mode event stream exactly once."""
+    # SSE mode emits partial events carrying text deltas, followed by
+    # a final event repeating the full text - skip that repeat
+    streamed = False
+    async for event in events:
+        text = event_text(event)
+        if not text:
+            continue
+        if getattr(event, 'partial', False):
+            streamed = True
+        elif streamed:
+            streamed = False
+            continue
+        yield text
@@ -5,15 +5,17 @@ UPDATED: Streamlined for modern voice server integration, clean evaluations.
 import logging
 import uuid
 import random
-from typing import Dict, List, Any, Optional
+from typing import AsyncIterator, Dict, List, Any, Optional
 import asyncio
 
 from google.adk.agents import LlmAgent
+from google.adk.agents.run_config import RunConfig, StreamingMode
 from google.adk.tools import FunctionTool
 from google.adk.runners import Runner
 from google.adk.sessions.in_memory_session_service import InMemorySessionService
 from google.genai.types import Content, Part
 
+from agents.adk_events import iter_sse_text
 from config import DEFAULT_MODEL, SCORE_THRESHOLDS, ADK_CONFIG
 
 logger = logging.getLogger(__name__)
@@ -264,7 +266,93 @@ class CompetencyAgent:
         """
         logger.info(f"Evaluating answer for {self.competency}")
         
-        prompt = f"""
+        prompt = self._build_evaluation_prompt(question, answer)
+        
+        try:
+            # Create session BEFORE calling run_async
+            user_id = "answer_evaluator"
+            session_id = f"eval_{uuid.uuid4().hex[:8]}"
+            
+            # Create session through session service
+            session = await self.session_service.create_session(
+                app_name=self.app_name,
+                user_id=user_id,
+                session_id=session_id
+            )
+            
+            logger.info(f"Created evaluation session: {session.id}")
+            
+            # Format prompt as Content object
+            content = Content(role="user", parts=[Part(text=prompt)])
+            
+            # Use Runner's run_async method with created session
+            events = []
+            async for event in self.runner.run_async(
+                user_id=user_id,
+                session_id=session_id,
+                new_message=content
+            ):
+                events.append(event)
+            
+            # Extract response from final event
+            response = self._extract_final_response(events)
+            
+            # Parse the evaluation response
+            evaluation = self._parse_evaluation_response(response, answer)
+            
+            return evaluation
+            
+        except Exception as e:
+            logger.error(f"Error evaluating answer: {str(e)}")
+            return self._generate_fallback_evaluation(answer)
+    
+    async def evaluate_answer_stream(
+        self,
+        question: Dict[str, Any],
+        answer: str
+    ) -> AsyncIterator[str]:
+        """
+        Stream the evaluation text as the model generates it.
+        Callers accumulate the chunks and hand the full text to parse_evaluation.
+        """
+        logger.info(f"Streaming evaluation for {self.competency}")
+        
+        prompt = self._build_evaluation_prompt(question, answer)
+        
+        try:
+            user_id = "answer_evaluator"
+            session_id = f"eval_{uuid.uuid4().hex[:8]}"
+            await self.session_service.create_session(
+                app_name=self.app_name,
+                user_id=user_id,
+                session_id=session_id
+            )
+            
+            content = Content(role="user", parts=[Part(text=prompt)])
+            
+            async for text in iter_sse_text(self.runner.run_async(
+                user_id=user_id,
+                session_id=session_id,
+                new_message=content,
+                run_config=RunConfig(streaming_mode=StreamingMode.SSE)
+            )):
+                yield text
+                    
+        except Exception as e:
+            # Re-raise so a failed stream is not parsed and scored as if it
+            # had finished
+            logger.error(f"Error streaming evaluation: {str(e)}")
+            raise
+    
+    def parse_evaluation(self, response: str, answer: str) -> Dict[str, Any]:
+        """Parse streamed evaluation text, falling back when nothing arrived."""
+        if not response.strip():
+            return self._generate_fallback_evaluation(answer)
+        return self._parse_evaluation_response(response, answer)
+    
+    def _build_evaluation_prompt(self, question: Dict[str, Any], answer: str) -> str:
+        """Build the evaluation prompt shared by the blocking and streaming paths."""
+        return f"""
         Evaluate this candidate's interview answer for a {self.competency} question 
         in the context of a {self.job_title} position.
         
@@ -314,44 +402,6 @@ class CompetencyAgent:
         
         Sample Strong Answer: [Provide a brief example of what a strong answer would include]
         """
-        
-        try:
-            # Create session BEFORE calling run_async
-            user_id = "answer_evaluator"
-            session_id = f"eval_{uuid.uuid4().hex[:8]}"
-            
-            # Create session through session service
-            session = await self.session_service.create_session(
-                app_name=self.app_name,
-                user_id=user_id,
-                session_id=session_id
-            )
-            
-            logger.info(f"Created evaluation session: {session.id}")
-            
-            # Format prompt as Content object
-            content = Content(role="user", parts=[Part(text=prompt)])
-            
-            # Use Runner's run_async method with created session
-            events = []
-            async for event in self.runner.run_async(
-                user_id=user_id,
-                session_id=session_id,
-                new_message=content
-            ):
-                events.append(event)
-            
-            # Extract response from final event
-            response = self._extract_final_response(events)
-            
-            # Parse the evaluation response
-            evaluation = self._parse_evaluation_response(response, answer)
-            
-            return evaluation
-            
-        except Exception as e:
-            logger.error(f"Error evaluating answer: {str(e)}")
-            return self._generate_fallback_evaluation(answer)
     
     def _extract_final_response(self, events: List[Any]) -> str:
         """Extract the final response text from ADK events."""
@@ -591,5 +641,6 @@ class CompetencyAgent:
             "advice": f"To improve your {self.competency} answers, focus on providing a clear STAR structure with specific details about the situation, your role, the actions you took, and the measurable results achieved.",
             "sample_answer": f"A strong {self.competency} answer would include: a specific situation from your {self.industry} experience, your clear role and responsibilities, detailed actions you took that demonstrate {self.competency}, and measurable outcomes that show the impact of your work.",
             "competency": self.competency,
-            "original_answer": answer
+            "original_answer": answer,
+            "is_fallback": True
         }
\ No newline at end of file
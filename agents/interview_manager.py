@@ -5,15 +5,17 @@ Uses correct session management and separates streaming from regular operations.
 import logging
 import asyncio
 import uuid
-from typing import Dict, List, Any, Optional
+from typing import AsyncIterator, Dict, List, Any, Optional, Tuple
 from collections import defaultdict
 
 from google.adk.agents import LlmAgent
+from google.adk.agents.run_config import RunConfig, StreamingMode
 from google.adk.tools import FunctionTool
 from google.adk.runners import InMemoryRunner
 from google.adk.sessions.in_memory_session_service import InMemorySessionService
 from google.genai.types import Content, Part
 
+from agents.adk_events import iter_sse_text
 from config import DEFAULT_MODEL, CORE_COMPETENCIES, ADK_CONFIG, VOICE_MODEL
 
 logger = logging.getLogger(__name__)
@@ -190,17 +192,7 @@ class InterviewManager:
             # Ensure conversation session is initialized
             await self.initialize_conversation_session()
             
-            full_prompt = f"""
-            Candidate question: {question}
-            
-            Additional context: {context}
-            
-            Please provide helpful, specific advice for interview preparation.
-            If this relates to a specific competency, mention which competency agent 
-            would be best suited for detailed practice.
-            
-            Focus on providing clear, actionable guidance based on the content of their question.
-            """
+            full_prompt = self._build_answer_prompt(question, context)
             
             # Use persistent session for conversation continuity
             content = Content(role="user", parts=[Part(text=full_prompt)])
@@ -221,6 +213,51 @@ class InterviewManager:
             logger.error(f"Error answering question: {str(e)}")
             return f"I apologize, but I encountered an error processing your question. Please try again."
     
+    async def answer_question_stream(self, question: str, context: str = "") -> AsyncIterator[str]:
+        """
+        Answer a general question, yielding text as the model produces it.
+        """
+        fallback = "I'm here to help with interview preparation. Could you please rephrase your question?"
+        yielded = False
+        try:
+            await self.initialize_conversation_session()
+            
+            content = Content(role="user", parts=[Part(text=self._build_answer_prompt(question, context))])
+            
+            async for text in iter_sse_text(self.http_runner.run_async(
+                user_id="candidate",
+                session_id=self.conversation_session_id,
+                new_message=content,
+                run_config=RunConfig(streaming_mode=StreamingMode.SSE)
+            )):
+                yielded = True
+                yield text
+            
+            if not yielded:
+                yield fallback
+                
+        except Exception as e:
+            logger.error(f"Error streaming answer: {str(e)}")
+            if not yielded:
+                yield "I apologize, but I encountered an error processing your question. Please try again."
+            else:
+                # Say so rather than let a cut-off answer look complete
+                yield "\n\n⚠️ This answer was interrupted by an error. Please ask again for the rest."
+    
+    def _build_answer_prompt(self, question: str, context: str) -> str:
+        """Build the general-advice prompt shared by the blocking and streaming paths."""
+        return f"""
+            Candidate question: {question}
+            
+            Additional context: {context}
+            
+            Please provide helpful, specific advice for interview preparation.
+            If this relates to a specific competency, mention which competency agent 
+            would be best suited for detailed practice.
+            
+            Focus on providing clear, actionable guidance based on the content of their question.
+            """
+    
     async def generate_practice_question(
         self,
         competency: str,
@@ -259,35 +296,111 @@ class InterviewManager:
         logger.info(f"Evaluated answer for {competency}, score: {score}/10")
         return evaluation
     
-    async def generate_practice_test(self, num_questions: int = 6) -> List[Dict[str, Any]]:
-        """Generate comprehensive practice test."""
-        questions = []
-        
-        # Distribute questions across competencies
-        competencies_to_use = self.competencies[:num_questions]
-        if len(competencies_to_use) < num_questions:
-            # Repeat competencies if needed
-            competencies_to_use.extend(
-                self.competencies[:num_questions - len(competencies_to_use)]
-            )
+    async def iter_evaluations(
+        self,
+        items: List[Tuple[Dict[str, Any], str]]
+    ) -> AsyncIterator[Tuple[int, Dict[str, Any]]]:
+        """
+        Evaluate (question, answer) pairs concurrently, yielding
+        (position, evaluation) as each finishes so callers can show progress.
+        """
+        timeout = ADK_CONFIG.get("evaluation_timeout")
         
-        # Generate questions in parallel for efficiency
-        tasks = []
-        for competency in competencies_to_use:
-            if competency in self.competency_agents:
-                task = self.generate_practice_question(competency)
-                tasks.append(task)
+        async def evaluate(position: int, question: Dict[str, Any], answer: str):
+            evaluation = await asyncio.wait_for(self.evaluate_answer(question, answer), timeout)
+            return position, evaluation
         
-        if tasks:
-            questions = await asyncio.gather(*tasks, return_exceptions=True)
-            
-            # Filter out any exceptions
-            valid_questions = [q for q in questions if isinstance(q, dict)]
-            
-            logger.info(f"Generated practice test with {len(valid_questions)} questions")
-            return valid_questions
+        tasks = [
+            asyncio.create_task(evaluate(position, question, answer))
+            for position, (question, answer) in enumerate(items)
+        ]
+        try:
+            for next_evaluation in asyncio.as_completed(tasks):
+                yield await next_evaluation
+        finally:
+            # A failure or early exit must not leave evaluations running in the
+            # background: they would still track progress, then be scored again
+            # on retry because their results never reached the caller.
+            for task in tasks:
+                task.cancel()
+    
+    async def evaluate_answer_stream(
+        self,
+        question: Dict[str, Any],
+        answer: str
+    ) -> AsyncIterator[str]:
+        """
+        Stream the evaluation text for an answer.
+        Pass the accumulated text to finish_evaluation to parse and record it.
+        """
+        competency = question.get("competency")
+        if competency not in self.competency_agents:
+            raise ValueError(f"No agent available for competency: {competency}")
+        
+        async for chunk in self.competency_agents[competency].evaluate_answer_stream(question, answer):
+            yield chunk
+    
+    async def finish_evaluation(
+        self,
+        question: Dict[str, Any],
+        answer: str,
+        response: str
+    ) -> Dict[str, Any]:
+        """Parse a streamed evaluation and track progress like evaluate_answer."""
+        competency = question.get("competency")
+        if competency not in self.competency_agents:
+            raise ValueError(f"No agent available for competency: {competency}")
+        
+        evaluation = self.competency_agents[competency].parse_evaluation(response, answer)
         
-        return []
+        score = evaluation.get("score", 0)
+        await self._track_progress_async(competency, score, f"Question: {question.get('id', 'unknown')}")
+        
+        logger.info(f"Evaluated answer for {competency}, score: {score}/10")
+        return evaluation
+    
+    async def generate_practice_test(self, num_questions: int = 6) -> List[Dict[str, Any]]:
+        """Generate comprehensive practice test."""
+        generated = [item async for item in self.iter_practice_test(num_questions)]
+        questions = [question for _, question in sorted(generated, key=lambda item: item[0])]
+        logger.info(f"Generated practice test with {len(questions)} questions")
+        return questions
+    
+    async def iter_practice_test(
+        self,
+        num_questions: int = 6
+    ) -> AsyncIterator[Tuple[int, Dict[str, Any]]]:
+        """
+        Generate practice test questions in parallel, yielding
+        (position, question) as each lands so callers can report progress;
+        position follows the competency order of the test.
+        """
+        # Distribute questions across competencies, repeating them if needed
+        competencies_to_use = [
+            self.competencies[i % len(self.competencies)]
+            for i in range(num_questions)
+        ] if self.competencies else []
+        
+        async def generate(position: int, competency: str):
+            return position, await self.generate_practice_question(competency)
+        
+        tasks = [
+            asyncio.create_task(generate(position, competency))
+            for position, competency in enumerate(competencies_to_use)
+            if competency in self.competency_agents
+        ]
+        try:
+            for next_question in asyncio.as_completed(tasks):
+                try:
+                    yield await next_question
+                except Exception as e:
+                    # Skip failed questions rather than failing the whole test
+                    logger.error(f"Error generating practice test question: {str(e)}")
+        finally:
+            # A consumer that stops early must not leave generations running
+            # on the session loop
+            for task in tasks:
+                task.cancel()
     
     async def analyze_performance(self, evaluations: List[Dict[str, Any]]) -> Dict[str, Any]:
         """Analyze overall performance across multiple evaluations."""
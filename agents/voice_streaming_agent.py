@@ -8,6 +8,8 @@ import uuid
 from typing import Dict, Any, Optional, AsyncGenerator
 from datetime import datetime
 
+import numpy as np
+
 from google.adk.agents import LlmAgent
 from google.adk.runners import InMemoryRunner
 from google.adk.sessions.in_memory_session_service import InMemorySessionService
@@ -217,12 +219,11 @@ class VoiceStreamingAgent:
             if not audio_data or len(audio_data) < 100:
                 return True
             
-            # Convert bytes to 16-bit integers for analysis
-            import struct
-            samples = struct.unpack(f'{len(audio_data)//2}h', audio_data)
+            # View bytes as 16-bit integers for analysis (no copy)
+            samples = np.frombuffer(audio_data, dtype=np.int16, count=len(audio_data) // 2)
             
             # Calculate RMS
-            rms = (sum(s*s for s in samples) / len(samples)) ** 0.5
+            rms = np.sqrt(np.mean(samples.astype(np.float32) ** 2))
             normalized_rms = rms / 32767.0  # Normalize to 0-1 range
             
             return normalized_rms < threshold
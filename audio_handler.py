@@ -2,14 +2,88 @@
 Audio Processing Handler for Voice Streaming
 Handles WebM to PCM conversion for ADK voice streaming.
 """
+import io
 import tempfile
 import subprocess
 import os
 import logging
-from typing import Optional
+from typing import Optional, Tuple
+
+import numpy as np
 
 logger = logging.getLogger(__name__)
 
+class PCMResampler:
+    """
+    Streaming int16 PCM downsampler (e.g. 48 kHz browser audio to 16 kHz).
+    Uses a windowed-sinc low-pass FIR evaluated by numpy, keeping the filter
+    history between frames so chunk boundaries stay click-free.
+    """
+    
+    def __init__(self, src_rate: int = 48000, dst_rate: int = 16000, num_taps: int = 63):
+        if src_rate % dst_rate:
+            raise ValueError(f"Unsupported resample ratio {src_rate}->{dst_rate}")
+        self.src_rate = src_rate
+        self.dst_rate = dst_rate
+        self.factor = src_rate // dst_rate
+        
+        # Low-pass just under the target Nyquist frequency
+        cutoff = 0.9 / self.factor
+        n = np.arange(num_taps) - (num_taps - 1) / 2
+        taps = cutoff * np.sinc(cutoff * n) * np.hamming(num_taps)
+        self.taps = (taps / taps.sum()).astype(np.float32)
+        
+        self._history = np.zeros(num_taps - 1, dtype=np.float32)
+        self._phase = 0
+    
+    def process(self, pcm: np.ndarray) -> np.ndarray:
+        """Resample one frame of int16 samples, returning int16 samples."""
+        if self.factor == 1:
+            return pcm.astype(np.int16, copy=False)
+        
+        signal = np.concatenate((self._history, pcm.astype(np.float32)))
+        filtered = np.convolve(signal, self.taps, mode="valid")
+        self._history = signal[len(signal) - len(self._history):]
+        
+        # Carry the decimation phase across frames of any length
+        out = filtered[self._phase::self.factor]
+        self._phase = (self._phase - len(filtered)) % self.factor
+        return np.clip(np.rint(out), -32768, 32767).astype(np.int16)
+
+def frame_to_pcm(frame, resampler: PCMResampler) -> Tuple[bytes, str]:
+    """
+    Convert a decoded WebRTC audio frame to mono int16 PCM for ADK.
+    Frames at the resampler's source rate are resampled; returns the PCM
+    bytes and their mime type.
+    """
+    # Packed s16 frames arrive as a (1, samples * channels) array, so keep
+    # the first channel only.
+    channels = len(frame.layout.channels)
+    pcm = frame.to_ndarray().reshape(-1, channels)[:, 0]
+    rate = frame.sample_rate
+    if rate == resampler.src_rate:
+        pcm, rate = resampler.process(pcm), resampler.dst_rate
+    return np.ascontiguousarray(pcm, dtype=np.int16).tobytes(), f"audio/pcm;rate={rate}"
+
+def decode_audio_to_pcm(audio_data: bytes, sample_rate: int = 16000) -> bytes:
+    """
+    Decode an encoded audio file (wav, mp3, m4a, ...) to mono int16 PCM.
+    Uses PyAV, which streamlit-webrtc already depends on, so the ADK side
+    receives its native input format instead of a container to transcode.
+    """
+    import av
+    
+    resampler = av.AudioResampler(format="s16", layout="mono", rate=sample_rate)
+    chunks = []
+    with av.open(io.BytesIO(audio_data)) as container:
+        for frame in container.decode(audio=0):
+            for out in resampler.resample(frame):
+                chunks.append(out.to_ndarray().tobytes())
+        # Flush samples still buffered in the resampler
+        for out in resampler.resample(None):
+            chunks.append(out.to_ndarray().tobytes())
+    return b"".join(chunks)
+
 class AudioProcessor:
     """Audio processor for WebM to PCM conversion."""
     
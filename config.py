@@ -57,6 +57,7 @@ ADK_CONFIG = {
         "response_modalities": ["TEXT", "AUDIO"],
         "default_response_modality": "TEXT"
     },
+    "evaluation_timeout": 120,  # seconds per answer evaluation
     "session_management": {
         "auto_cleanup": True,
         "session_timeout": 1800,  # 30 minutes
@@ -223,7 +224,10 @@ AUDIO_CONFIG = {
     "streaming": {
         "real_time": True,
         "low_latency": True,
-        "buffer_management": "automatic"
+        "buffer_management": "automatic",
+        # Skip browser audio processing and remote ICE for localhost clients
+        "local_low_latency": True,
+        "stun_servers": ["stun:stun.l.google.com:19302"]
     }
 }
 
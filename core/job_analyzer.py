@@ -194,7 +194,8 @@ class JobAnalyzer:
                 "skills": [],
                 "benefits": [],
                 "remote_work": False,
-                "salary_range": None
+                "salary_range": None,
+                "is_fallback": True
             }
     
     def _determine_industry(self, text: str, basic_info: Dict[str, Any]) -> str:
@@ -16,10 +16,32 @@ from google.adk.agents import LiveRequestQueue
 from google.adk.agents.run_config import RunConfig
 from google.adk.runners import InMemoryRunner
 from google.adk.sessions.in_memory_session_service import InMemorySessionService
-from google.genai.types import Part, Content, Blob
+from google.genai.types import Blob, AudioTranscriptionConfig
+
+try:
+    import orjson  # faster JSON for control messages; optional
+except ImportError:
+    orjson = None
 
 logger = logging.getLogger(__name__)
 
+# Uplink frames are raw little-endian 16-bit mono PCM at this rate; the
+# browser client resamples to it before sending binary WebSocket frames.
+UPLINK_SAMPLE_RATE = 16000
+
+async def _send_json(websocket: WebSocket, message: Dict[str, Any]):
+    """Send a control message as a text frame, serialized with orjson if available."""
+    text = None
+    if orjson is not None:
+        try:
+            text = orjson.dumps(message).decode()
+        except TypeError:
+            pass  # Types orjson rejects go through json
+    if text is None:
+        text = json.dumps(message, separators=(",", ":"), ensure_ascii=False)
+    # Text frames only: the client treats every binary frame as agent audio
+    await websocket.send_text(text)
+
 class ADKVoiceStreamingServer:
     """
     Real-time voice streaming server using ADK's native capabilities.
@@ -70,7 +92,8 @@ class ADKVoiceStreamingServer:
             # Configure for real-time audio streaming
             run_config = RunConfig(
                 response_modalities=["AUDIO", "TEXT"],
-                enable_audio_streaming=True
+                enable_audio_streaming=True,
+                input_audio_transcription=AudioTranscriptionConfig()
             )
             
             # Create live request queue for bidirectional streaming
@@ -105,7 +128,7 @@ class ADKVoiceStreamingServer:
             logger.info(f"Voice session {session_id} disconnected")
         except Exception as e:
             logger.error(f"Error in voice streaming session {session_id}: {str(e)}")
-            await websocket.send_json({
+            await _send_json(websocket, {
                 "type": "error",
                 "message": f"Streaming error: {str(e)}"
             })
@@ -123,7 +146,7 @@ class ADKVoiceStreamingServer:
         Just speak naturally - I'm listening and will respond in real-time!
         """
         
-        await websocket.send_json({
+        await _send_json(websocket, {
             "type": "agent_greeting",
             "content": greeting,
             "timestamp": time.time()
@@ -133,30 +156,14 @@ class ADKVoiceStreamingServer:
         """Handle incoming audio from the client."""
         try:
             while True:
-                # Receive audio data from WebSocket
+                # Receive a binary PCM frame from WebSocket
                 data = await websocket.receive_bytes()
                 
-                # Create audio blob for ADK
-                audio_blob = Blob(
-                    mime_type="audio/wav",  # Assuming WAV format
+                # Hand the frame to ADK as-is: no decode, re-encode or ack
+                live_request_queue.send_realtime(Blob(
+                    mime_type=f"audio/pcm;rate={UPLINK_SAMPLE_RATE}",
                     data=data
-                )
-                
-                # Create content with audio
-                audio_content = Content(
-                    role="user",
-                    parts=[Part(inline_data=audio_blob)]
-                )
-                
-                # Send to ADK for processing
-                await live_request_queue.put(audio_content)
-                
-                # Send acknowledgment to client
-                await websocket.send_json({
-                    "type": "audio_received",
-                    "timestamp": time.time(),
-                    "session_id": session_id
-                })
+                ))
                 
         except WebSocketDisconnect:
             logger.info(f"Client disconnected from session {session_id}")
@@ -165,14 +172,31 @@ class ADKVoiceStreamingServer:
     
     async def handle_outgoing_responses(self, websocket: WebSocket, session_id: str, live_events):
         """Handle outgoing responses from ADK."""
+        heard = ""
+        
         try:
             async for event in live_events:
+                # Forward what the user is saying while they are still saying it;
+                # interim text is a running hypothesis the final one replaces
+                transcription = getattr(event, 'input_transcription', None)
+                if transcription and transcription.text:
+                    is_final = bool(getattr(transcription, 'finished', False))
+                    heard = (transcription.text or heard) if is_final else heard + transcription.text
+                    await _send_json(websocket, {
+                        "type": "user_transcript",
+                        "text": heard,
+                        "is_final": is_final,
+                        "timestamp": time.time()
+                    })
+                    if is_final:
+                        heard = ""
+                
                 if event.content and event.content.parts:
                     for part in event.content.parts:
                         
                         # Handle text responses
                         if part.text:
-                            await websocket.send_json({
+                            await _send_json(websocket, {
                                 "type": "agent_text_response",
                                 "content": part.text,
                                 "timestamp": time.time(),
@@ -181,18 +205,12 @@ class ADKVoiceStreamingServer:
                         
                         # Handle audio responses
                         elif hasattr(part, 'inline_data') and part.inline_data:
-                            # Send audio response
-                            await websocket.send_json({
-                                "type": "agent_audio_response",
-                                "audio_data": part.inline_data.data.hex(),  # Send as hex string
-                                "mime_type": part.inline_data.mime_type,
-                                "timestamp": time.time(),
-                                "session_id": session_id
-                            })
+                            # Send PCM audio as a binary frame
+                            await websocket.send_bytes(part.inline_data.data)
                 
                 # Handle session completion
                 if hasattr(event, 'finish_reason') and event.finish_reason:
-                    await websocket.send_json({
+                    await _send_json(websocket, {
                         "type": "session_complete",
                         "reason": event.finish_reason,
                         "timestamp": time.time()
@@ -259,10 +277,48 @@ class ADKVoiceStreamingServer:
             </div>
             
             <script>
+                const UPLINK_SAMPLE_RATE = 16000;
+                const PLAYBACK_SAMPLE_RATE = 24000;  // Live API audio output rate
+                const FRAME_SAMPLES = 640;  // 40 ms per uplink frame
+                
+                // Runs on the audio rendering thread: packs 128-sample render
+                // quanta into Int16 frames and transfers them to the page
+                const PCM_WORKLET = `
+                    class PcmUplink extends AudioWorkletProcessor {
+                        constructor(options) {
+                            super();
+                            this.size = options.processorOptions.frameSamples;
+                            this.frame = new Int16Array(this.size);
+                            this.filled = 0;
+                        }
+                        process(inputs) {
+                            const samples = inputs[0][0];
+                            if (!samples) {
+                                return true;
+                            }
+                            for (let i = 0; i < samples.length; i++) {
+                                const s = Math.max(-1, Math.min(1, samples[i]));
+                                this.frame[this.filled++] = s < 0 ? s * 0x8000 : s * 0x7FFF;
+                                if (this.filled === this.size) {
+                                    this.port.postMessage(this.frame.buffer, [this.frame.buffer]);
+                                    this.frame = new Int16Array(this.size);
+                                    this.filled = 0;
+                                }
+                            }
+                            return true;
+                        }
+                    }
+                    registerProcessor('pcm-uplink', PcmUplink);
+                `;
+                
                 let websocket = null;
-                let mediaRecorder = null;
                 let audioStream = null;
+                let captureContext = null;
+                let captureNode = null;
+                let playbackContext = null;
+                let playbackTime = 0;
                 let isRecording = false;
+                let transcriptDiv = null;
                 
                 const statusDiv = document.getElementById('status');
                 const conversationDiv = document.getElementById('conversation');
@@ -281,6 +337,7 @@ class ADKVoiceStreamingServer:
                     try {
                         const wsUrl = `ws://localhost:8000/voice_stream/${sessionId}`;
                         websocket = new WebSocket(wsUrl);
+                        websocket.binaryType = 'arraybuffer';
                         
                         websocket.onopen = function() {
                             statusDiv.className = 'status connected';
@@ -290,6 +347,10 @@ class ADKVoiceStreamingServer:
                         };
                         
                         websocket.onmessage = function(event) {
+                            if (event.data instanceof ArrayBuffer) {
+                                playAudioResponse(event.data);
+                                return;
+                            }
                             const data = JSON.parse(event.data);
                             handleADKResponse(data);
                         };
@@ -315,17 +376,34 @@ class ADKVoiceStreamingServer:
                 
                 async function startRecording() {
                     try {
-                        audioStream = await navigator.mediaDevices.getUserMedia({ audio: true });
-                        mediaRecorder = new MediaRecorder(audioStream, { mimeType: 'audio/webm;codecs=opus' });
+                        // Mono with no extra input buffering; echo cancellation
+                        // stays on because responses play through the speakers
+                        audioStream = await navigator.mediaDevices.getUserMedia({
+                            audio: { channelCount: 1, latency: 0 }
+                        });
+                        
+                        // The context resamples the microphone to the uplink rate
+                        captureContext = new AudioContext({ sampleRate: UPLINK_SAMPLE_RATE });
+                        const workletUrl = URL.createObjectURL(new Blob([PCM_WORKLET], { type: 'application/javascript' }));
+                        await captureContext.audioWorklet.addModule(workletUrl);
+                        URL.revokeObjectURL(workletUrl);
                         
-                        mediaRecorder.ondataavailable = function(event) {
-                            if (event.data.size > 0 && websocket.readyState === WebSocket.OPEN) {
-                                // Send audio data to ADK
+                        const source = captureContext.createMediaStreamSource(audioStream);
+                        captureNode = new AudioWorkletNode(captureContext, 'pcm-uplink', {
+                            numberOfInputs: 1,
+                            numberOfOutputs: 0,
+                            channelCount: 1,
+                            processorOptions: { frameSamples: FRAME_SAMPLES }
+                        });
+                        
+                        captureNode.port.onmessage = function(event) {
+                            // Send raw PCM to ADK as a binary frame
+                            if (websocket.readyState === WebSocket.OPEN) {
                                 websocket.send(event.data);
                             }
                         };
                         
-                        mediaRecorder.start(1000); // Send chunks every 1 second
+                        source.connect(captureNode);
                         isRecording = true;
                         
                         statusDiv.className = 'status recording pulse';
@@ -342,8 +420,9 @@ class ADKVoiceStreamingServer:
                 }
                 
                 function stopRecording() {
-                    if (mediaRecorder && isRecording) {
-                        mediaRecorder.stop();
+                    if (captureContext && isRecording) {
+                        captureNode.disconnect();
+                        captureContext.close();
                         audioStream.getTracks().forEach(track => track.stop());
                         isRecording = false;
                         
@@ -364,13 +443,8 @@ class ADKVoiceStreamingServer:
                         case 'agent_text_response':
                             addMessage('agent', data.content);
                             break;
-                        case 'agent_audio_response':
-                            addMessage('agent', '[Audio Response] ' + data.content);
-                            // TODO: Play audio response
-                            playAudioResponse(data.audio_data, data.mime_type);
-                            break;
-                        case 'audio_received':
-                            addMessage('system', 'ADK received your audio - generating response...');
+                        case 'user_transcript':
+                            showTranscript(data.text, data.is_final);
                             break;
                         case 'session_complete':
                             addMessage('system', 'Session completed');
@@ -381,6 +455,18 @@ class ADKVoiceStreamingServer:
                     }
                 }
                 
+                function showTranscript(text, isFinal) {
+                    // One live line per utterance, rewritten as the hypothesis grows
+                    if (!transcriptDiv) {
+                        transcriptDiv = addMessage('user', '');
+                    }
+                    transcriptDiv.querySelector('.content').textContent = text;
+                    transcriptDiv.style.opacity = isFinal ? '1' : '0.6';
+                    if (isFinal) {
+                        transcriptDiv = null;
+                    }
+                }
+                
                 function addMessage(sender, content) {
                     const messageDiv = document.createElement('div');
                     messageDiv.className = 'message ' + (sender === 'user' ? 'user-message' : 'agent-message');
@@ -388,24 +474,34 @@ class ADKVoiceStreamingServer:
                     const timestamp = new Date().toLocaleTimeString();
                     const icon = sender === 'user' ? '🗣️' : sender === 'agent' ? '🤖' : '⚙️';
                     
-                    messageDiv.innerHTML = `<strong>${icon} ${sender.charAt(0).toUpperCase() + sender.slice(1)}:</strong> ${content} <small style="color: #666;">[${timestamp}]</small>`;
+                    messageDiv.innerHTML = `<strong>${icon} ${sender.charAt(0).toUpperCase() + sender.slice(1)}:</strong> <span class="content">${content}</span> <small style="color: #666;">[${timestamp}]</small>`;
                     
                     conversationDiv.appendChild(messageDiv);
                     conversationDiv.scrollTop = conversationDiv.scrollHeight;
+                    return messageDiv;
                 }
                 
-                function playAudioResponse(hexData, mimeType) {
+                function playAudioResponse(buffer) {
                     try {
-                        // Convert hex string back to binary
-                        const bytes = new Uint8Array(hexData.match(/.{1,2}/g).map(byte => parseInt(byte, 16)));
-                        const blob = new Blob([bytes], { type: mimeType });
-                        const audioUrl = URL.createObjectURL(blob);
+                        if (!playbackContext) {
+                            playbackContext = new AudioContext({ sampleRate: PLAYBACK_SAMPLE_RATE });
+                        }
                         
-                        const audio = new Audio(audioUrl);
-                        audio.play().catch(e => console.error('Error playing audio:', e));
+                        // Interpret the frame as little-endian 16-bit PCM
+                        const pcm = new Int16Array(buffer);
+                        const audioBuffer = playbackContext.createBuffer(1, pcm.length, PLAYBACK_SAMPLE_RATE);
+                        const channel = audioBuffer.getChannelData(0);
+                        for (let i = 0; i < pcm.length; i++) {
+                            channel[i] = pcm[i] / 0x8000;
+                        }
                         
-                        // Cleanup
-                        audio.onended = () => URL.revokeObjectURL(audioUrl);
+                        // Queue chunks back to back so playback stays gapless
+                        const node = playbackContext.createBufferSource();
+                        node.buffer = audioBuffer;
+                        node.connect(playbackContext.destination);
+                        playbackTime = Math.max(playbackTime, playbackContext.currentTime);
+                        node.start(playbackTime);
+                        playbackTime += audioBuffer.duration;
                     } catch (error) {
                         console.error('Error playing audio response:', error);
                     }
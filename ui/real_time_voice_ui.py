@@ -3,24 +3,38 @@ Real-time voice streaming interface using ADK's native capabilities.
 This implements actual bidirectional voice streaming, not file upload.
 """
 import streamlit as st
+import streamlit.components.v1 as components
 import asyncio
+import html
 import json
+from collections import deque
 from typing import Dict, Any
 import time
 
+import av
+from streamlit_webrtc import WebRtcMode, webrtc_streamer
+
+from audio_handler import PCMResampler, frame_to_pcm
+from config import AUDIO_CONFIG
+from ui.session_loop import fmt_hms, get_loop, is_local_client, start_audio_sender
+
+# Only the tail of the live conversation is ever rendered
+_LIVE_CONVERSATION_LIMIT = 100
+_LIVE_CONVERSATION_VISIBLE = 10
+
 def render_real_time_voice_practice(self):
     """Render real-time ADK voice streaming interface."""
+    ss = st.session_state
     st.header("🎙️ Real-Time ADK Voice Streaming")
     
-    if not st.session_state.voice_enabled:
+    if not ss.voice_enabled:
         st.warning("⚠️ Voice is disabled. Enable it in the sidebar to use this feature.")
         return
     
     st.info("🚀 **True ADK Native Voice Streaming** - Real-time bidirectional audio")
     
     # Voice streaming status
-    if not hasattr(st.session_state, 'voice_streaming_active'):
-        st.session_state.voice_streaming_active = False
+    active = ss.setdefault('voice_streaming_active', False)
     
     col1, col2 = st.columns([1, 1])
     
@@ -28,9 +42,10 @@ def render_real_time_voice_practice(self):
         st.subheader("🎤 Live Voice Control")
         
         # Real-time voice streaming controls
-        if not st.session_state.voice_streaming_active:
-            if st.button("🔴 Start Live Voice Streaming", type="primary", key="start_live_voice"):
-                self._start_real_time_voice_streaming()
+        if not active:
+            # State flips in the callback, before the rerun renders the page
+            st.button("🔴 Start Live Voice Streaming", type="primary", key="start_live_voice",
+                      on_click=self._start_real_time_voice_streaming)
         else:
             # Show active streaming status
             st.success("🟢 **LIVE STREAMING ACTIVE**")
@@ -42,48 +57,46 @@ def render_real_time_voice_practice(self):
             </div>
             """, unsafe_allow_html=True)
             
-            if st.button("⏹️ Stop Live Streaming", type="secondary", key="stop_live_voice"):
-                self._stop_real_time_voice_streaming()
+            st.button("⏹️ Stop Live Streaming", type="secondary", key="stop_live_voice",
+                      on_click=self._stop_real_time_voice_streaming)
+            
+            # Microphone uplink over WebRTC
+            self._render_webrtc_audio_uplink()
         
         # Voice streaming stats
-        if st.session_state.voice_streaming_active:
+        if active:
             st.subheader("📊 Streaming Stats")
             
             # Real-time stats (would be updated from ADK)
-            stats_placeholder = st.empty()
-            with stats_placeholder.container():
-                col_a, col_b = st.columns(2)
-                with col_a:
-                    st.metric("Session Time", f"{self._get_session_duration()}s")
-                    st.metric("Voice Exchanges", st.session_state.get('voice_exchanges', 0))
-                with col_b:
-                    st.metric("Audio Quality", "Excellent")
-                    st.metric("Latency", "~200ms")
-    
+            col_a, col_b = st.columns(2)
+            with col_a:
+                _render_session_timer(ss.get('voice_stream_start_time', time.time()))
+                st.metric("Voice Exchanges", ss.get('voice_exchanges', 0))
+            with col_b:
+                st.metric("Audio Quality", "Excellent")
+                st.metric("Latency", "~200ms")
+
     with col2:
         st.subheader("💬 Live Conversation Stream")
         
         # Real-time conversation display
-        conversation_placeholder = st.empty()
-        
-        if st.session_state.voice_streaming_active:
-            # This would show real-time conversation updates
-            self._render_live_conversation_stream(conversation_placeholder)
+        if active:
+            # Polls for new messages without rerunning the whole page
+            self._render_live_conversation_stream()
         else:
-            with conversation_placeholder.container():
-                st.info("Start live voice streaming to see real-time conversation here!")
-                
-                # Show example of what it would look like
-                st.markdown("#### 🎯 Example Live Stream:")
-                st.markdown("""
-                ```
-                🎙️ You: "Give me a practice question"
-                🤖 ADK: "Great! I have a problem-solving question..."
-                🎙️ You: "That sounds good, let me think..."
-                🤖 ADK: "Take your time! When ready, use STAR method..."
-                ```
-                """)
-    
+            st.info("Start live voice streaming to see real-time conversation here!")
+            
+            # Show example of what it would look like
+            st.markdown("#### 🎯 Example Live Stream:")
+            st.markdown("""
+            ```
+            🎙️ You: "Give me a practice question"
+            🤖 ADK: "Great! I have a problem-solving question..."
+            🎙️ You: "That sounds good, let me think..."
+            🤖 ADK: "Take your time! When ready, use STAR method..."
+            ```
+            """)
+
     # Technical implementation details
     with st.expander("🔧 ADK Streaming Implementation Details"):
         st.markdown("""
@@ -111,127 +124,206 @@ def render_real_time_voice_practice(self):
         - Low-latency playback (~200ms)
         
         **4. WebRTC Integration:**
-        - Browser MediaRecorder API
-        - WebSocket connection to ADK backend
-        - Real-time audio encoding/decoding
+        - Browser microphone captured by `streamlit-webrtc` (UDP/SRTP media track)
+        - Decoded frames pushed to ADK as raw 16-bit PCM
+        - No base64/JSON wrapping on the audio path
         """)
 
 def _start_real_time_voice_streaming(self):
     """Start real-time voice streaming with ADK."""
+    ss = st.session_state
     try:
-        st.session_state.voice_streaming_active = True
-        st.session_state.voice_stream_start_time = time.time()
-        st.session_state.voice_exchanges = 0
-        st.session_state.live_conversation = []
+        ss.voice_streaming_active = True
+        ss.voice_stream_start_time = time.time()
+        ss.voice_exchanges = 0
+        ss.live_conversation = deque(maxlen=_LIVE_CONVERSATION_LIMIT)
+        ss.voice_low_latency = (
+            AUDIO_CONFIG["streaming"]["local_low_latency"] and is_local_client()
+        )
         
         # Initialize ADK streaming session
-        if hasattr(st.session_state, 'interview_manager'):
-            # Start ADK live streaming session
-            streaming_task = asyncio.create_task(
-                st.session_state.interview_manager.start_voice_session()
+        interview_manager = ss.get('interview_manager')
+        if interview_manager is not None:
+            # Start ADK live streaming session on the background loop
+            streaming_task = asyncio.run_coroutine_threadsafe(
+                interview_manager.start_voice_session(), get_loop()
             )
-            st.session_state.adk_streaming_task = streaming_task
+            ss.adk_streaming_task = streaming_task
         
         st.success("🚀 ADK Live Voice Streaming Started!")
-        st.experimental_rerun()
         
     except Exception as e:
         st.error(f"Failed to start voice streaming: {str(e)}")
-        st.session_state.voice_streaming_active = False
+        ss.voice_streaming_active = False
 
 def _stop_real_time_voice_streaming(self):
     """Stop real-time voice streaming."""
+    ss = st.session_state
     try:
-        st.session_state.voice_streaming_active = False
+        ss.voice_streaming_active = False
         
         # Stop ADK streaming task
-        if hasattr(st.session_state, 'adk_streaming_task'):
-            st.session_state.adk_streaming_task.cancel()
-            del st.session_state.adk_streaming_task
+        streaming_task = ss.pop('adk_streaming_task', None)
+        if streaming_task is not None:
+            streaming_task.cancel()
+        
+        # Stop forwarding microphone audio
+        audio_sender = ss.pop('voice_audio_sender', None)
+        if audio_sender is not None:
+            audio_sender[2].cancel()
         
         # Reset voice session
-        if hasattr(st.session_state, 'interview_manager'):
-            st.session_state.interview_manager.voice_agent.reset_session()
+        interview_manager = ss.get('interview_manager')
+        if interview_manager is not None:
+            interview_manager.voice_agent.reset_session()
         
         st.info("⏹️ Voice streaming stopped.")
-        st.experimental_rerun()
         
     except Exception as e:
         st.error(f"Error stopping voice streaming: {str(e)}")
 
-def _get_session_duration(self) -> int:
-    """Get current session duration in seconds."""
-    if hasattr(st.session_state, 'voice_stream_start_time'):
-        return int(time.time() - st.session_state.voice_stream_start_time)
-    return 0
+def _render_webrtc_audio_uplink(self):
+    """Stream microphone audio to ADK over a WebRTC media track."""
+    interview_manager = st.session_state.get('interview_manager')
+    if interview_manager is None:
+        st.info("Analyze a job description to enable the live microphone.")
+        return
+    
+    voice_agent = interview_manager.voice_agent
+    loop = get_loop()
+    
+    # Created once per session so filter state survives reruns; aiortc
+    # decodes Opus at 48 kHz and ADK expects 16 kHz input.
+    if 'voice_resampler' not in st.session_state:
+        st.session_state.voice_resampler = PCMResampler(
+            48000, AUDIO_CONFIG["input"]["sample_rate"]
+        )
+    resampler = st.session_state.voice_resampler
+    
+    # One sender per session and agent; frames must reach ADK in order
+    audio_sender = st.session_state.get('voice_audio_sender')
+    if audio_sender is None or audio_sender[0] is not voice_agent or audio_sender[2].done():
+        audio_sender = st.session_state.voice_audio_sender = (
+            voice_agent, *start_audio_sender(voice_agent, loop)
+        )
+    audio_queue = audio_sender[1]
+    
+    def audio_frame_callback(frame: av.AudioFrame) -> av.AudioFrame:
+        # Runs on the WebRTC worker thread; the frame is not sent back
+        loop.call_soon_threadsafe(audio_queue.put_nowait, frame_to_pcm(frame, resampler))
+        return frame
+    
+    # WebRTC already carries the uplink as Opus; mono capture keeps the
+    # encoder at a single channel's bitrate.
+    audio_constraints = {"channelCount": 1}
+    if st.session_state.get('voice_low_latency', False):
+        # On loopback there is no network jitter or echo path to correct
+        # for, so browser processing and its buffering are pure delay.
+        ice_servers = []
+        audio_constraints.update(
+            echoCancellation=False,
+            noiseSuppression=False,
+            autoGainControl=False,
+            latency=0,
+        )
+    else:
+        ice_servers = [{"urls": AUDIO_CONFIG["streaming"]["stun_servers"]}]
+    
+    webrtc_streamer(
+        key="adk_live_voice_uplink",
+        mode=WebRtcMode.SENDRECV,
+        rtc_configuration={"iceServers": ice_servers, "iceTransportPolicy": "all"},
+        media_stream_constraints={"audio": audio_constraints, "video": False},
+        audio_frame_callback=audio_frame_callback,
+        sendback_audio=False,
+    )
+
+# Live conversation message templates, keyed by message type
+_MESSAGE_TEMPLATES = {
+    'user_voice': (
+        '<div style="background: #e3f2fd; padding: 0.5rem; margin: 0.2rem 0; border-radius: 5px;">'
+        '<small style="color: #666;">[{ts}]</small><br>'
+        '🎙️ <strong>You:</strong> {content}</div>'
+    ),
+    'adk_response': (
+        '<div style="background: #f3e5f5; padding: 0.5rem; margin: 0.2rem 0; border-radius: 5px;">'
+        '<small style="color: #666;">[{ts}]</small><br>'
+        '🤖 <strong>ADK Coach:</strong> {content}</div>'
+    ),
+    'system': (
+        '<div style="background: #fff3e0; padding: 0.5rem; margin: 0.2rem 0; border-radius: 5px;">'
+        '<small style="color: #666;">[{ts}]</small><br>'
+        '⚙️ <em>{content}</em></div>'
+    ),
+}
+
+def _render_session_timer(start_ts: float):
+    """Render a session clock that ticks in the browser, not via reruns."""
+    # The iframe only remounts when start_ts changes, so reruns leave the
+    # running clock untouched.
+    components.html(f"""
+    <div style="font-family: 'Source Sans Pro', sans-serif;">
+        <div style="font-size: 0.875rem; color: rgba(49, 51, 63, 0.6);">Session Time</div>
+        <div id="session-time" data-start="{start_ts}" style="font-size: 2rem;">0s</div>
+    </div>
+    <script>
+    const el = document.getElementById('session-time');
+    const tick = () => {{
+        el.textContent = Math.floor(Date.now() / 1000 - el.dataset.start) + 's';
+    }};
+    tick();
+    setInterval(tick, 1000);
+    </script>
+    """, height=80)
 
-def _render_live_conversation_stream(self, placeholder):
+@st.fragment(run_every=0.5)
+def _render_live_conversation_stream(self):
     """Render live conversation stream with real-time updates."""
-    with placeholder.container():
-        st.markdown("#### 🔴 LIVE CONVERSATION")
-        
-        # Live conversation container with auto-scroll
-        live_container = st.container()
-        
-        with live_container:
-            # Show live conversation messages
-            if hasattr(st.session_state, 'live_conversation'):
-                for i, message in enumerate(st.session_state.live_conversation[-10:]):  # Last 10 messages
-                    timestamp = message.get('timestamp', time.time())
-                    time_str = time.strftime("%H:%M:%S", time.localtime(timestamp))
-                    
-                    if message['type'] == 'user_voice':
-                        st.markdown(f"""
-                        <div style="background: #e3f2fd; padding: 0.5rem; margin: 0.2rem 0; border-radius: 5px;">
-                            <small style="color: #666;">[{time_str}]</small><br>
-                            🎙️ <strong>You:</strong> {message['content']}
-                        </div>
-                        """, unsafe_allow_html=True)
-                    
-                    elif message['type'] == 'adk_response':
-                        st.markdown(f"""
-                        <div style="background: #f3e5f5; padding: 0.5rem; margin: 0.2rem 0; border-radius: 5px;">
-                            <small style="color: #666;">[{time_str}]</small><br>
-                            🤖 <strong>ADK Coach:</strong> {message['content']}
-                        </div>
-                        """, unsafe_allow_html=True)
-                    
-                    elif message['type'] == 'system':
-                        st.markdown(f"""
-                        <div style="background: #fff3e0; padding: 0.5rem; margin: 0.2rem 0; border-radius: 5px;">
-                            <small style="color: #666;">[{time_str}]</small><br>
-                            ⚙️ <em>{message['content']}</em>
-                        </div>
-                        """, unsafe_allow_html=True)
-            
-            # Live status indicator
-            if st.session_state.voice_streaming_active:
-                st.markdown("""
-                <div style="text-align: center; margin: 1rem 0;">
-                    <div style="display: inline-block; width: 12px; height: 12px; 
-                                background: #4CAF50; border-radius: 50%; 
-                                animation: pulse 1.5s infinite;"></div>
-                    <span style="margin-left: 0.5rem; color: #4CAF50; font-weight: bold;">
-                        Listening for voice input...
-                    </span>
-                </div>
-                """, unsafe_allow_html=True)
-        
-        # Voice commands help
-        st.markdown("#### 🎯 Voice Commands You Can Use:")
+    ss = st.session_state
+    conversation = ss.get('live_conversation')
+    active = ss.get('voice_streaming_active', False)
+    st.markdown("#### 🔴 LIVE CONVERSATION")
+    
+    # Show live conversation messages in a single markdown element. Content
+    # is escaped here, whoever wrote it, since the markup allows raw HTML.
+    if conversation is not None:
+        rows = []
+        for message in list(conversation)[-_LIVE_CONVERSATION_VISIBLE:]:
+            template = _MESSAGE_TEMPLATES.get(message['type'])
+            if template is not None:
+                time_str = fmt_hms(int(message.get('timestamp', time.time())))
+                rows.append(template.format(
+                    ts=time_str, content=html.escape(message['content'], quote=False)
+                ))
+        if rows:
+            st.markdown("".join(rows), unsafe_allow_html=True)
+    
+    # Live status indicator
+    if active:
         st.markdown("""
-        - *"Give me a practice question"*
-        - *"I want to practice [competency name]"*
-        - *"Evaluate my answer"*
-        - *"Switch to mock interview mode"*
-        - *"Help me with technical skills"*
-        - *"Start a challenging question"*
-        """)
+        <div style="text-align: center; margin: 1rem 0;">
+            <div style="display: inline-block; width: 12px; height: 12px; 
+                        background: #4CAF50; border-radius: 50%; 
+                        animation: pulse 1.5s infinite;"></div>
+            <span style="margin-left: 0.5rem; color: #4CAF50; font-weight: bold;">
+                Listening for voice input...
+            </span>
+        </div>
+        """, unsafe_allow_html=True)
 
-# CSS for animations
-def add_voice_streaming_css():
-    """Add CSS for voice streaming animations."""
+    # Voice commands help
+    st.markdown("#### 🎯 Voice Commands You Can Use:")
     st.markdown("""
+    - *"Give me a practice question"*
+    - *"I want to practice [competency name]"*
+    - *"Evaluate my answer"*
+    - *"Switch to mock interview mode"*
+    - *"Help me with technical skills"*
+    - *"Start a challenging question"*
+    """)
+
+# CSS for animations, built once at import time.
+_VOICE_STREAMING_CSS = """
     <style>
     @keyframes pulse {
         0% { opacity: 1; transform: scale(1); }
@@ -265,4 +357,10 @@ def add_voice_streaming_css():
         animation: pulse 2s infinite;
     }
     </style>
-    """, unsafe_allow_html=True)
\ No newline at end of file
+"""
+
+def add_voice_streaming_css():
+    """Add CSS for voice streaming animations."""
+    # Streamlit drops elements that are not re-sent on a rerun, so the style
+    # block is emitted every run; only the prebuilt constant is re-sent.
+    st.markdown(_VOICE_STREAMING_CSS, unsafe_allow_html=True)
@@ -0,0 +1,121 @@
+"""
+Per-session background event loops for the Streamlit UI.
+Streamlit's script thread has no running event loop, so agent calls and
+ADK streaming coroutines run on a loop owned by a daemon thread, one per
+browser session, kept in st.session_state across reruns. Also holds the
+session helpers both voice streaming pages share.
+"""
+import streamlit as st
+import asyncio
+import functools
+import logging
+import threading
+import time
+import weakref
+from concurrent.futures import Future
+from typing import Tuple
+
+try:
+    import uvloop  # libuv-based loop; optional and POSIX-only
+except ImportError:
+    uvloop = None
+
+logger = logging.getLogger(__name__)
+
+_LOCAL_HOSTS = {"localhost", "127.0.0.1", "::1", "[::1]"}
+
+def _run_loop(loop: asyncio.AbstractEventLoop):
+    """Run a loop until stopped, then release its selector and resources."""
+    try:
+        loop.run_forever()
+    finally:
+        # Cancel what is still pending (audio senders, ADK streams) and let
+        # it unwind, as asyncio.run does, before the loop is closed
+        pending = asyncio.all_tasks(loop)
+        for task in pending:
+            task.cancel()
+        if pending:
+            loop.run_until_complete(asyncio.gather(*pending, return_exceptions=True))
+        loop.run_until_complete(loop.shutdown_asyncgens())
+        loop.close()
+
+def _stop(loop: asyncio.AbstractEventLoop):
+    """Ask a loop to stop from any thread; a no-op once it has closed."""
+    if not loop.is_closed():
+        loop.call_soon_threadsafe(loop.stop)
+
+class _LoopOwner:
+    """
+    Session-state sentinel tying a loop to its session. Streamlit drops the
+    session's state when the session ends, and collecting the owner stops
+    the loop, so abandoned sessions do not keep their thread alive.
+    """
+    def __init__(self, loop: asyncio.AbstractEventLoop):
+        # finalize also runs at interpreter exit for loops still alive then
+        self.stop = weakref.finalize(self, _stop, loop)
+
+def get_loop() -> asyncio.AbstractEventLoop:
+    """
+    Return this session's background event loop, starting it on first use.
+    Must be called from the script thread; worker threads should be handed
+    the loop instead.
+    """
+    loop = st.session_state.get('bg_loop')
+    if loop is None or loop.is_closed():
+        loop = uvloop.new_event_loop() if uvloop else asyncio.new_event_loop()
+        threading.Thread(target=_run_loop, args=(loop,), name="interview-ui-loop", daemon=True).start()
+        st.session_state['bg_loop_owner'] = _LoopOwner(loop)
+        st.session_state['bg_loop'] = loop
+    return loop
+
+def stop_loop():
+    """Stop this session's background loop, if it has one."""
+    owner = st.session_state.get('bg_loop_owner')
+    if owner is not None:
+        owner.stop()
+
+def run_async(coro):
+    """Run a coroutine on the background loop and wait for its result."""
+    # One long-lived loop keeps the agents' HTTP clients and their pooled
+    # connections alive across reruns instead of rebuilding them per click.
+    return asyncio.run_coroutine_threadsafe(coro, get_loop()).result()
+
+def iter_async(agen):
+    """Drain an async generator on the background loop as a plain iterator."""
+    loop = get_loop()
+    while True:
+        try:
+            yield asyncio.run_coroutine_threadsafe(agen.__anext__(), loop).result()
+        except StopAsyncIteration:
+            return
+
+def start_audio_sender(
+    voice_agent, loop: asyncio.AbstractEventLoop
+) -> Tuple[asyncio.Queue, Future]:
+    """
+    Start a single consumer on `loop` that forwards (pcm, mime_type) chunks
+    to ADK. Producers on other threads enqueue with
+    loop.call_soon_threadsafe(queue.put_nowait, item); one consumer keeps
+    chunks in capture order.
+    """
+    audio_queue = asyncio.Queue()
+    
+    async def drain():
+        while True:
+            chunk, mime_type = await audio_queue.get()
+            try:
+                await voice_agent.send_audio_to_stream(chunk, mime_type)
+            except Exception as e:
+                logger.error(f"Error sending audio to ADK: {str(e)}")
+    
+    return audio_queue, asyncio.run_coroutine_threadsafe(drain(), loop)
+
+def is_local_client() -> bool:
+    """Check whether the browser reached the app through a loopback host."""
+    host = st.context.headers.get("Host", "")
+    return host.rsplit(":", 1)[0] in _LOCAL_HOSTS
+
+@functools.lru_cache(maxsize=4096)
+def fmt_hms(sec: int) -> str:
+    """Format a whole-second timestamp as local HH:MM:SS."""
+    return time.strftime("%H:%M:%S", time.localtime(sec))
@@ -4,18 +4,30 @@ FULLY REWRITTEN: Complete implementation with all features.
 """
 import streamlit as st
 import asyncio
-import pandas as pd
-import plotly.express as px
-import plotly.graph_objects as go
+import csv
 from datetime import datetime, timedelta
+import hashlib
+import io
 import json
+import re
 import time
-from typing import Dict, List, Any, Optional
+from typing import TYPE_CHECKING, Dict, List, Any, Optional
 
 from core.job_analyzer import JobAnalyzer
 from agents.interview_manager import InterviewManager
 from enhanced_streamlit_voice_client import DynamicVoiceComponent
 from config import APP_NAME, CORE_COMPETENCIES
+from ui.session_loop import get_loop, iter_async, run_async, stop_loop
+
+if TYPE_CHECKING:
+    # Imported lazily where used; named here only for annotations
+    import pandas as pd
+    import plotly.graph_objects as go
+
+try:
+    import orjson  # faster JSON for report downloads; optional
+except ImportError:
+    orjson = None
 
 # Configure Streamlit page
 st.set_page_config(
@@ -25,8 +37,115 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
-# Custom CSS for better styling
-st.markdown("""
+def _dumps_report(report: Dict[str, Any]) -> bytes:
+    """Serialize a report as indented JSON bytes, preferring orjson."""
+    if orjson is not None:
+        try:
+            return orjson.dumps(report, option=orjson.OPT_INDENT_2)
+        except TypeError:
+            pass  # Types orjson rejects (e.g. non-str keys) go through json
+    return json.dumps(report, indent=2).encode()
+
+@st.cache_resource(show_spinner=False)
+def _get_job_analyzer() -> JobAnalyzer:
+    """Shared job analyzer; it holds only the model client, no user state."""
+    return JobAnalyzer()
+
+@st.cache_data(show_spinner=False, max_entries=64, ttl=timedelta(hours=6))
+def _cached_analyze(jd_sha: str, _job_description: str) -> Dict[str, Any]:
+    """Analyze a job description once per distinct text (keyed by its SHA-256)."""
+    return _get_job_analyzer().analyze_job_description(_job_description)
+
+@st.cache_resource(show_spinner=False)
+def _get_voice_component() -> DynamicVoiceComponent:
+    """Shared voice component so its clients survive reruns."""
+    return DynamicVoiceComponent()
+
+# Chat messages rendered by default; older ones sit behind a toggle.
+_CHAT_VISIBLE_MESSAGES = 30
+
+# Spoken filler words that suggest an answer was dictated rather than typed.
+_VOICE_INDICATORS = frozenset({
+    "um", "uh", "er", "ah", "you know", "like", "so", "well",
+    "i mean", "basically", "actually", "kind of", "sort of"
+})
+
+# All indicators in one case-insensitive pass; longest first so multi-word
+# phrases win over their prefixes.
+_VOICE_FILLER_RE = re.compile(
+    r'\b(?:' + '|'.join(sorted(map(re.escape, _VOICE_INDICATORS), key=lambda w: (-len(w), w))) + r')\b',
+    re.IGNORECASE
+)
+
+# Upper bound on evaluations memoized per session.
+_EVALUATION_CACHE_SIZE = 500
+
+@st.cache_data(show_spinner=False, max_entries=32)
+def _score_progression_figure(scores: tuple, competencies: tuple, voice_flags: tuple) -> "go.Figure":
+    """Scatter of scores over time, split by input method."""
+    import numpy as np
+    import pandas as pd
+    import plotly.express as px
+    
+    scores_df = pd.DataFrame({
+        'Question': np.arange(1, len(scores) + 1),
+        'Score': np.asarray(scores),
+        'Competency': competencies,
+        'Input Method': np.where(voice_flags, '🎤 Voice', '⌨️ Text')
+    })
+    fig = px.scatter(
+        scores_df,
+        x='Question',
+        y='Score',
+        color='Input Method',
+        symbol='Competency',
+        title='Score Progression by Input Method',
+        hover_data=['Competency'],
+        render_mode='webgl'
+    )
+    fig.update_layout(yaxis_range=[0, 10], uirevision='score-progression')
+    fig.update_xaxes(uirevision='x')
+    fig.update_yaxes(uirevision='y')
+    return fig
+
+@st.cache_data(show_spinner=False, max_entries=32)
+def _competency_breakdown_figure(scores: tuple, competencies: tuple) -> "go.Figure":
+    """Horizontal bar of average score per competency."""
+    import pandas as pd
+    import plotly.express as px
+    
+    stats = pd.Series(scores).groupby(list(competencies), sort=False).agg(['mean', 'count'])
+    comp_df = pd.DataFrame({
+        'Competency': stats.index,
+        'Average Score': stats['mean'].to_numpy(),
+        'Attempts': stats['count'].to_numpy()
+    })
+    fig = px.bar(
+        comp_df,
+        x='Average Score',
+        y='Competency',
+        orientation='h',
+        title='Average Score by Competency',
+        color='Average Score',
+        color_continuous_scale='RdYlGn'
+    )
+    fig.update_layout(xaxis_range=[0, 10], uirevision='competency-breakdown')
+    fig.update_xaxes(uirevision='x')
+    fig.update_yaxes(uirevision='y')
+    return fig
+
+@st.cache_data(show_spinner=False, max_entries=32)
+def _breakdown_df(rows: tuple) -> "pd.DataFrame":
+    """Table of the AI analysis' per-competency breakdown."""
+    import pandas as pd
+    
+    return pd.DataFrame(
+        rows,
+        columns=['Competency', 'Average Score', 'Attempts', 'Latest Score', 'Improvement']
+    )
+
+# Custom CSS for better styling, built once at import time.
+_APP_CSS = """
 <style>
     .main-header {
         background: linear-gradient(90deg, #667eea 0%, #764ba2 100%);
@@ -82,20 +201,19 @@ st.markdown("""
         margin: 0.5rem 0;
     }
 </style>
-""", unsafe_allow_html=True)
+"""
 
 class CompleteInterviewUI:
     """Complete UI with seamless voice integration for practice questions and tests."""
     
     def __init__(self):
         """Initialize the complete UI."""
-        self.voice_component = DynamicVoiceComponent()
+        self.voice_component = _get_voice_component()
         self.initialize_session_state()
     
     def initialize_session_state(self):
         """Initialize Streamlit session state variables."""
         defaults = {
-            'job_analyzer': None,
             'interview_manager': None,
             'job_info': None,
             'current_question': None,
@@ -108,11 +226,27 @@ class CompleteInterviewUI:
             'practice_test_questions': [],
             'practice_test_answers': {},
             'practice_test_evaluations': {},
+            'practice_test_voice_inputs': {},
             'practice_test_current_index': 0,
             'practice_test_completed': False,
             'progress_data': {},
             'performance_analysis': None,
-            'voice_transcript_cache': {}  # Cache for voice transcripts
+            'voice_transcript_cache': {},  # Cache for voice transcripts
+            'evaluation_cache': {},  # (question, answer, job) hash -> evaluation
+            'performance_analysis_key': None,
+            # Running aggregates over evaluation_results, kept by _record_evaluation
+            'score_sum': 0,
+            'score_count': 0,
+            'voice_count': 0,
+            'voice_score_sum': 0,
+            'text_score_sum': 0,
+            'text_score_count': 0,
+            'comp_score_sums': {},
+            'comp_score_counts': {},
+            # Columnar copies of the evaluation scores for the progress charts
+            'eval_scores': [],
+            'eval_competencies': [],
+            'eval_voice_flags': []
         }
         
         for key, default_value in defaults.items():
@@ -169,11 +303,14 @@ class CompleteInterviewUI:
                     st.markdown(f"**{comp}**: <span class='{score_class}'>{score:.1f}/10</span>", 
                               unsafe_allow_html=True)
                 
-                st.markdown(f"**Total Questions:** {len(st.session_state.evaluation_results)}")
+                st.markdown(f"**Total Questions:** {st.session_state.score_count}")
                 
                 # Voice usage stats
-                voice_count = sum(1 for e in st.session_state.evaluation_results if e.get('was_voice_input', False))
-                st.markdown(f"**🎤 Voice Used:** {voice_count} times")
+                st.markdown(f"**🎤 Voice Used:** {st.session_state.voice_count} times")
+            
+            if st.session_state.evaluation_cache and st.button("🧹 Clear Evaluation Cache", type="secondary"):
+                st.session_state.evaluation_cache.clear()
+                st.session_state.performance_analysis_key = None
             
             # Reset button
             if st.button("🔄 Reset Application", type="secondary"):
@@ -288,6 +425,10 @@ class CompleteInterviewUI:
             # Generate question button
             if st.button("🔄 Generate New Question", type="primary"):
                 self._generate_practice_question(competency, difficulty)
+            
+            # Once practice is under way, have the next question ready early
+            if st.session_state.current_question:
+                self._prefetch_practice_question(competency, difficulty)
         
         with col2:
             st.subheader("ℹ️ Voice & Text Tips")
@@ -392,14 +533,23 @@ class CompleteInterviewUI:
             # Test in progress or completed
             self._render_enhanced_practice_test_questions()
     
+    @st.fragment
     def render_chat_interface(self):
         """Render the chat interface for general questions."""
         st.header("💬 Interview Preparation Chat")
         
-        # Display chat history
+        # Display chat history; only the most recent messages are rendered
+        # unless the user asks for the rest
+        history = st.session_state.chat_history
+        earlier = max(len(history) - _CHAT_VISIBLE_MESSAGES, 0)
+        
         chat_container = st.container(height=400)
         with chat_container:
-            for message in st.session_state.chat_history:
+            if earlier and st.toggle(f"Show {earlier} earlier messages", key="chat_show_earlier"):
+                visible = history
+            else:
+                visible = history[earlier:]
+            for message in visible:
                 with st.chat_message(message["role"]):
                     st.markdown(message["content"])
         
@@ -414,14 +564,12 @@ class CompleteInterviewUI:
             
             # Get response
             with st.chat_message("assistant"):
-                with st.spinner("Thinking..."):
-                    # Use proper async handling
-                    loop = asyncio.new_event_loop()
-                    asyncio.set_event_loop(loop)
-                    response = loop.run_until_complete(
-                        st.session_state.interview_manager.answer_question(prompt)
-                    )
-                st.markdown(response)
+                # The sentinel shows immediately and the first token replaces it
+                placeholder = st.empty()
+                placeholder.markdown("_Thinking..._")
+                response = placeholder.write_stream(
+                    iter_async(st.session_state.interview_manager.answer_question_stream(prompt))
+                )
             
             # Add assistant response
             st.session_state.chat_history.append({"role": "assistant", "content": response})
@@ -434,16 +582,24 @@ class CompleteInterviewUI:
             st.info("💡 Complete some practice questions or tests to see your progress here!")
             return
         
+        # Fragments keep analysis and export clicks from rerunning the whole app
+        self._render_progress_overview()
+        self._render_export_options()
+    
+    @st.fragment
+    def _render_progress_overview(self):
+        """Render metrics, charts and AI analysis for the reports tab."""
+        ss = st.session_state
+        
         # Voice input statistics
-        voice_count = sum(1 for eval_data in st.session_state.evaluation_results 
-                         if eval_data.get('was_voice_input', False))
-        text_count = len(st.session_state.evaluation_results) - voice_count
+        voice_count = ss.voice_count
+        text_count = ss.text_score_count
         
         # Overall metrics including voice stats
         col1, col2, col3, col4 = st.columns(4)
         
-        total_questions = len(st.session_state.evaluation_results)
-        avg_score = sum(eval_data['score'] for eval_data in st.session_state.evaluation_results) / total_questions
+        total_questions = ss.score_count
+        avg_score = ss.score_sum / total_questions
         
         with col1:
             st.metric("Total Questions", total_questions)
@@ -458,25 +614,19 @@ class CompleteInterviewUI:
         if voice_count > 0 and text_count > 0:
             st.subheader("📊 Input Method Performance")
             
-            voice_scores = [eval_data['score'] for eval_data in st.session_state.evaluation_results 
-                           if eval_data.get('was_voice_input', False)]
-            text_scores = [eval_data['score'] for eval_data in st.session_state.evaluation_results 
-                          if not eval_data.get('was_voice_input', False)]
+            voice_avg = ss.voice_score_sum / voice_count
+            text_avg = ss.text_score_sum / text_count
             
-            if voice_scores and text_scores:
-                voice_avg = sum(voice_scores) / len(voice_scores)
-                text_avg = sum(text_scores) / len(text_scores)
-                
-                col1, col2 = st.columns(2)
-                with col1:
-                    st.metric("🎤 Voice Average", f"{voice_avg:.1f}/10")
-                with col2:
-                    st.metric("⌨️ Text Average", f"{text_avg:.1f}/10")
-                
-                # Performance insight
-                if abs(voice_avg - text_avg) > 0.5:
-                    better_method = "voice" if voice_avg > text_avg else "text"
-                    st.info(f"💡 **Insight**: You perform {abs(voice_avg - text_avg):.1f} points better with {better_method} input!")
+            col1, col2 = st.columns(2)
+            with col1:
+                st.metric("🎤 Voice Average", f"{voice_avg:.1f}/10")
+            with col2:
+                st.metric("⌨️ Text Average", f"{text_avg:.1f}/10")
+            
+            # Performance insight
+            if abs(voice_avg - text_avg) > 0.5:
+                better_method = "voice" if voice_avg > text_avg else "text"
+                st.info(f"💡 **Insight**: You perform {abs(voice_avg - text_avg):.1f} points better with {better_method} input!")
         
         # Progress charts and analysis
         self._render_progress_charts()
@@ -490,44 +640,49 @@ class CompleteInterviewUI:
         
         if st.session_state.performance_analysis:
             self._display_performance_analysis()
-        
-        # Export options
+    
+    @st.fragment
+    def _render_export_options(self):
+        """Render the report, CSV and study plan export buttons."""
         st.subheader("📤 Export Options")
         col1, col2, col3 = st.columns(3)
         
+        # One timestamp per run, shared by every export and file name
+        now = datetime.now()
+        stamp = now.strftime('%Y%m%d_%H%M%S')
+        
         with col1:
             if st.button("📋 Export Progress Report"):
-                report_data = self._generate_progress_report()
                 st.download_button(
                     "⬇️ Download Report",
-                    data=json.dumps(report_data, indent=2),
-                    file_name=f"interview_progress_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json",
+                    data=_dumps_report(self._generate_progress_report(now)),
+                    file_name=f"interview_progress_{stamp}.json",
                     mime="application/json"
                 )
         
         with col2:
             if st.button("📊 Export to CSV"):
-                csv_data = self._generate_csv_export()
                 st.download_button(
                     "⬇️ Download CSV",
-                    data=csv_data,
-                    file_name=f"interview_scores_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv",
+                    data=self._generate_csv_export(now),
+                    file_name=f"interview_scores_{stamp}.csv",
                     mime="text/csv"
                 )
         
         with col3:
             if st.button("🎯 Create Study Plan"):
-                study_plan = self._generate_study_plan()
+                study_plan = self._generate_study_plan(now)
                 st.success("Study plan generated!")
                 st.json(study_plan)
     
+    @st.fragment
     def _render_enhanced_practice_test_questions(self):
         """Render the enhanced practice test questions interface with voice."""
         questions = st.session_state.practice_test_questions
         total_questions = len(questions)
         
         # Progress bar
-        completed = len(st.session_state.practice_test_evaluations)
+        completed = len(st.session_state.practice_test_answers)
         progress = completed / total_questions if total_questions > 0 else 0
         
         st.progress(progress, text=f"Progress: {completed}/{total_questions} questions completed")
@@ -554,6 +709,19 @@ class CompleteInterviewUI:
                                if st.session_state.voice_enabled else False)
                     
                     self._submit_test_answer(current_idx, current_question, answer, was_voice)
+            with col3:
+                if st.button("⏭️ Submit All & Finish", disabled=not (completed or answer.strip())):
+                    # Detect if answer was likely from voice
+                    was_voice = (self._detect_voice_input(answer) 
+                               if st.session_state.voice_enabled else False)
+                    
+                    self._submit_all_pending(current_idx, answer, was_voice)
+        
+        elif not st.session_state.practice_test_completed:
+            # All answers are in but the batch evaluation failed
+            st.warning("⚠️ Your answers are saved but could not be evaluated yet.")
+            if st.button("🔁 Retry Evaluation", type="primary") and self._evaluate_practice_test():
+                st.rerun()
         
         else:
             # Test completed
@@ -567,16 +735,20 @@ class CompleteInterviewUI:
         if not evaluations:
             return
         
-        # Overall score and input method stats
-        avg_score = sum(eval_data['score'] for eval_data in evaluations) / len(evaluations)
-        voice_answers = sum(1 for eval_data in evaluations if eval_data.get('was_voice_input', False))
+        import numpy as np
+        
+        # Overall score and input method stats in one vectorized pass
+        scores = np.fromiter((e['score'] for e in evaluations), dtype=np.float32, count=len(evaluations))
+        voices = np.fromiter((e.get('was_voice_input', False) for e in evaluations), dtype=np.bool_, count=len(evaluations))
+        avg_score = float(scores.mean())
+        best_score = scores.max()
+        voice_answers = int(voices.sum())
         
         col1, col2, col3, col4 = st.columns(4)
         with col1:
             st.metric("Overall Score", f"{avg_score:.1f}/10")
         with col2:
-            best_score = max(eval_data['score'] for eval_data in evaluations)
-            st.metric("Best Score", f"{best_score}/10")
+            st.metric("Best Score", f"{best_score:g}/10")
         with col3:
             st.metric("🎤 Voice Used", f"{voice_answers}/{len(evaluations)}")
         with col4:
@@ -586,7 +758,8 @@ class CompleteInterviewUI:
         # Results by question with input method indicators
         st.subheader("📋 Detailed Results")
         
-        for i, (question, evaluation) in enumerate(zip(st.session_state.practice_test_questions, evaluations)):
+        for i, evaluation in st.session_state.practice_test_evaluations.items():
+            question = st.session_state.practice_test_questions[i]
             with st.expander(f"Q{i+1}: {question['competency']} - Score: {evaluation['score']}/10"):
                 
                 # Input method indicator
@@ -610,103 +783,112 @@ class CompleteInterviewUI:
     
     def _render_progress_charts(self):
         """Render progress charts and analysis."""
-        # Progress charts implementation
+        # Figures are cached on the score columns, so unrelated reruns
+        # skip the DataFrame and Plotly construction entirely; stable keys
+        # let the frontend patch the mounted charts instead of remounting
+        chart_config = {'displayModeBar': False}
+        scores = tuple(st.session_state.eval_scores)
+        competencies = tuple(st.session_state.eval_competencies)
+        voice_flags = tuple(st.session_state.eval_voice_flags)
         col1, col2 = st.columns([2, 1])
         
         with col1:
             st.subheader("📈 Score Progression")
-            
-            # Create score progression chart with input method
-            scores_df = pd.DataFrame([
-                {
-                    'Question': i+1,
-                    'Score': eval_data['score'],
-                    'Competency': eval_data['competency'],
-                    'Input Method': '🎤 Voice' if eval_data.get('was_voice_input', False) else '⌨️ Text'
-                }
-                for i, eval_data in enumerate(st.session_state.evaluation_results)
-            ])
-            
-            if not scores_df.empty:
-                fig = px.scatter(
-                    scores_df,
-                    x='Question',
-                    y='Score',
-                    color='Input Method',
-                    symbol='Competency',
-                    title='Score Progression by Input Method',
-                    hover_data=['Competency']
+            if scores:
+                st.plotly_chart(
+                    _score_progression_figure(scores, competencies, voice_flags),
+                    use_container_width=True,
+                    config=chart_config,
+                    key="score_progression_chart"
                 )
-                fig.update_layout(yaxis_range=[0, 10])
-                st.plotly_chart(fig, use_container_width=True)
         
         with col2:
             st.subheader("🎯 Competency Breakdown")
-            
-            # Competency average scores
-            competency_scores = {}
-            for eval_data in st.session_state.evaluation_results:
-                comp = eval_data['competency']
-                if comp not in competency_scores:
-                    competency_scores[comp] = []
-                competency_scores[comp].append(eval_data['score'])
-            
-            if competency_scores:
-                comp_df = pd.DataFrame([
-                    {
-                        'Competency': comp,
-                        'Average Score': sum(scores) / len(scores),
-                        'Attempts': len(scores)
-                    }
-                    for comp, scores in competency_scores.items()
-                ])
-                
-                fig = px.bar(
-                    comp_df,
-                    x='Average Score',
-                    y='Competency',
-                    orientation='h',
-                    title='Average Score by Competency',
-                    color='Average Score',
-                    color_continuous_scale='RdYlGn'
+            if scores:
+                st.plotly_chart(
+                    _competency_breakdown_figure(scores, competencies),
+                    use_container_width=True,
+                    config=chart_config,
+                    key="competency_breakdown_chart"
                 )
-                fig.update_layout(xaxis_range=[0, 10])
-                st.plotly_chart(fig, use_container_width=True)
     
     # Helper methods for practice questions and tests
     def _generate_practice_question(self, competency: str, difficulty: str):
         """Generate a single practice question."""
         with st.spinner(f"🎯 Generating {difficulty} {competency} question..."):
             try:
-                loop = asyncio.new_event_loop()
-                asyncio.set_event_loop(loop)
-                question = loop.run_until_complete(
-                    st.session_state.interview_manager.generate_practice_question(
-                        competency, difficulty=difficulty
+                future = st.session_state.pop('next_q_future', None)
+                if st.session_state.pop('next_q_key', None) != (competency, difficulty):
+                    if future is not None:
+                        future.cancel()
+                    future = None
+                
+                question = None
+                if future is not None:
+                    try:
+                        question = future.result()
+                    except Exception:
+                        pass  # Regenerate below if the prefetch failed
+                
+                if question is None:
+                    question = run_async(
+                        st.session_state.interview_manager.generate_practice_question(
+                            competency, difficulty=difficulty
+                        )
                     )
-                )
                 st.session_state.current_question = question
                 st.success(f"✅ Generated {competency} question!")
                 st.rerun()
             except Exception as e:
                 st.error(f"Error generating question: {str(e)}")
     
+    def _prefetch_practice_question(self, competency: str, difficulty: str):
+        """Start generating the next practice question in the background."""
+        key = (competency, difficulty)
+        if st.session_state.get('next_q_key') == key:
+            return
+        
+        stale = st.session_state.get('next_q_future')
+        if stale is not None:
+            stale.cancel()
+        
+        st.session_state['next_q_key'] = key
+        st.session_state['next_q_future'] = asyncio.run_coroutine_threadsafe(
+            st.session_state.interview_manager.generate_practice_question(
+                competency, difficulty=difficulty
+            ),
+            get_loop()
+        )
+    
     def _evaluate_practice_answer(self, question: Dict[str, Any], answer: str, was_voice: bool = False):
         """Evaluate a practice answer with voice input context."""
         with st.spinner("🤖 Evaluating your answer..."):
             try:
-                loop = asyncio.new_event_loop()
-                asyncio.set_event_loop(loop)
-                evaluation = loop.run_until_complete(
-                    st.session_state.interview_manager.evaluate_answer(question, answer)
-                )
+                manager = st.session_state.interview_manager
+                key = self._evaluation_key(question, answer)
+                evaluation = self._cached_evaluation(key)
+                
+                if evaluation is None:
+                    # Show the feedback as it is generated, then parse the full text
+                    placeholder = st.empty()
+                    response = ""
+                    for chunk in iter_async(manager.evaluate_answer_stream(question, answer)):
+                        response += chunk
+                        placeholder.markdown(response)
+                    
+                    evaluation = run_async(manager.finish_evaluation(question, answer, response))
+                    placeholder.empty()
+                    # A heuristic fallback stands in for this attempt only;
+                    # caching it would stop a retry from getting a real score
+                    if not evaluation.get('is_fallback'):
+                        self._store_evaluation(key, evaluation)
                 
                 # Add voice input context to evaluation
                 evaluation['was_voice_input'] = was_voice
                 evaluation['input_method'] = '🎤 Voice' if was_voice else '⌨️ Text'
                 
                 st.session_state.current_evaluation = evaluation
-                st.session_state.evaluation_results.append(evaluation)
+                self._record_evaluation(evaluation)
                 st.success("✅ Answer evaluated!")
                 st.rerun()
             except Exception as e:
@@ -714,54 +896,153 @@ class CompleteInterviewUI:
     
     def _start_practice_test(self, num_questions: int):
         """Start a comprehensive practice test."""
-        with st.spinner(f"🎯 Generating {num_questions} practice questions..."):
-            try:
-                loop = asyncio.new_event_loop()
-                asyncio.set_event_loop(loop)
-                questions = loop.run_until_complete(
-                    st.session_state.interview_manager.generate_practice_test(num_questions)
+        progress = st.progress(0.0, text=f"🎯 Generating {num_questions} practice questions...")
+        try:
+            # Questions land in completion order; keep them in test order
+            generated = {}
+            for position, question in iter_async(st.session_state.interview_manager.iter_practice_test(num_questions)):
+                generated[position] = question
+                progress.progress(
+                    len(generated) / num_questions,
+                    text=f"🎯 Generated {len(generated)} of {num_questions} questions..."
                 )
-                st.session_state.practice_test_questions = questions
-                st.session_state.practice_test_answers = {}
-                st.session_state.practice_test_evaluations = {}
-                st.session_state.practice_test_current_index = 0
-                st.session_state.practice_test_completed = False
-                st.success(f"✅ Generated {len(questions)} questions!")
-                st.rerun()
-            except Exception as e:
-                st.error(f"Error generating practice test: {str(e)}")
+            questions = [generated[position] for position in sorted(generated)]
+            st.session_state.practice_test_questions = questions
+            st.session_state.practice_test_answers = {}
+            st.session_state.practice_test_evaluations = {}
+            st.session_state.practice_test_voice_inputs = {}
+            st.session_state.practice_test_current_index = 0
+            st.session_state.practice_test_completed = False
+            st.success(f"✅ Generated {len(questions)} questions!")
+            st.rerun()
+        except Exception as e:
+            st.error(f"Error generating practice test: {str(e)}")
     
     def _submit_test_answer(self, idx: int, question: Dict[str, Any], answer: str, was_voice: bool = False):
-        """Submit a test answer with voice input context."""
-        with st.spinner("Evaluating answer..."):
-            try:
-                loop = asyncio.new_event_loop()
-                asyncio.set_event_loop(loop)
-                evaluation = loop.run_until_complete(
-                    st.session_state.interview_manager.evaluate_answer(question, answer)
-                )
-                
-                # Add voice input context
-                evaluation['was_voice_input'] = was_voice
-                evaluation['input_method'] = '🎤 Voice' if was_voice else '⌨️ Text'
-                
-                st.session_state.practice_test_answers[idx] = answer
-                st.session_state.practice_test_evaluations[idx] = evaluation
-                st.session_state.evaluation_results.append(evaluation)
-                
-                # Check if test is completed
-                if len(st.session_state.practice_test_evaluations) == len(st.session_state.practice_test_questions):
-                    st.session_state.practice_test_completed = True
-                
-                st.rerun()
-            except Exception as e:
-                st.error(f"Error evaluating answer: {str(e)}")
+        """Record a test answer; the whole test is evaluated once the last one is in."""
+        ss = st.session_state
+        ss.practice_test_answers[idx] = answer
+        ss.practice_test_voice_inputs[idx] = was_voice
+        
+        if len(ss.practice_test_answers) < len(ss.practice_test_questions):
+            # Moving to the next question only changes the test panel
+            st.rerun(scope="fragment")
+        
+        # Finishing the test updates the sidebar and reports, so rerun it all
+        if self._evaluate_practice_test():
+            st.rerun()
+    
+    def _submit_all_pending(self, idx: int, answer: str, was_voice: bool = False):
+        """Finish the test early, evaluating every answered question at once."""
+        if answer.strip():
+            st.session_state.practice_test_answers[idx] = answer
+            st.session_state.practice_test_voice_inputs[idx] = was_voice
+        
+        # One concurrent batch and a single rerun, whatever the answer count
+        if self._evaluate_practice_test():
+            st.rerun()
+    
+    def _evaluate_practice_test(self) -> bool:
+        """Evaluate every practice test answer in one concurrent batch."""
+        ss = st.session_state
+        
+        # Already evaluated and recorded; never record the same test twice
+        if ss.practice_test_completed:
+            return True
+        indices = sorted(ss.practice_test_answers)
+        keys = {
+            idx: self._evaluation_key(ss.practice_test_questions[idx], ss.practice_test_answers[idx])
+            for idx in indices
+        }
+        
+        # Only answers that have not been evaluated before go to the model
+        evaluations = {idx: self._cached_evaluation(keys[idx]) for idx in indices}
+        pending = [idx for idx in indices if evaluations[idx] is None]
+        
+        if pending:
+            with st.status(f"Evaluating {len(pending)} answers...") as status:
+                try:
+                    pairs = [
+                        (ss.practice_test_questions[idx], ss.practice_test_answers[idx])
+                        for idx in pending
+                    ]
+                    for done, (position, evaluation) in enumerate(
+                        iter_async(ss.interview_manager.iter_evaluations(pairs)), 1
+                    ):
+                        # Cache each result as it lands so a retry skips it
+                        idx = pending[position]
+                        if not evaluation.get('is_fallback'):
+                            self._store_evaluation(keys[idx], evaluation)
+                        evaluations[idx] = evaluation
+                        status.update(label=f"Scored {done} of {len(pending)} answers...")
+                        status.write(f"✅ Question {idx + 1}: {evaluation.get('score', 0)}/10")
+                except Exception as e:
+                    status.update(label="Evaluation interrupted", state="error")
+                    st.error(f"Error evaluating answers: {str(e)}")
+                    return False
+                status.update(label="All answers evaluated", state="complete")
+        
+        for idx in indices:
+            evaluation = evaluations[idx]
+            # Add voice input context
+            was_voice = ss.practice_test_voice_inputs.get(idx, False)
+            evaluation['was_voice_input'] = was_voice
+            evaluation['input_method'] = '🎤 Voice' if was_voice else '⌨️ Text'
+            
+            ss.practice_test_evaluations[idx] = evaluation
+            self._record_evaluation(evaluation)
+        
+        ss.practice_test_completed = True
+        return True
+    
+    def _evaluation_key(self, question: Dict[str, Any], answer: str) -> tuple:
+        """Key an evaluation so whitespace and case changes still hit the cache."""
+        question_hash = hashlib.sha256(question.get('question', '').encode()).hexdigest()
+        answer_norm = " ".join(answer.lower().split())
+        job_hash = hashlib.sha256(
+            json.dumps(st.session_state.job_info, sort_keys=True, default=str).encode()
+        ).hexdigest()
+        return (question_hash, answer_norm, job_hash)
+    
+    def _cached_evaluation(self, key: tuple) -> Optional[Dict[str, Any]]:
+        """Return a copy of a memoized evaluation, or None on a miss."""
+        cached = st.session_state.evaluation_cache.get(key)
+        return dict(cached) if cached is not None else None
+    
+    def _store_evaluation(self, key: tuple, evaluation: Dict[str, Any]):
+        """Memoize an evaluation, dropping the oldest entry when full."""
+        cache = st.session_state.evaluation_cache
+        if len(cache) >= _EVALUATION_CACHE_SIZE:
+            cache.pop(next(iter(cache)))
+        cache[key] = dict(evaluation)
+    
+    def _record_evaluation(self, evaluation: Dict[str, Any]):
+        """Append an evaluation and update the running aggregates in O(1)."""
+        ss = st.session_state
+        score = evaluation['score']
+        
+        ss.evaluation_results.append(evaluation)
+        ss.eval_scores.append(score)
+        ss.eval_competencies.append(evaluation['competency'])
+        ss.eval_voice_flags.append(evaluation.get('was_voice_input', False))
+        ss.score_sum += score
+        ss.score_count += 1
+        if evaluation.get('was_voice_input', False):
+            ss.voice_count += 1
+            ss.voice_score_sum += score
+        else:
+            ss.text_score_count += 1
+            ss.text_score_sum += score
+        competency = evaluation['competency']
+        ss.comp_score_sums[competency] = ss.comp_score_sums.get(competency, 0) + score
+        ss.comp_score_counts[competency] = ss.comp_score_counts.get(competency, 0) + 1
     
     def _reset_practice_test(self):
         """Reset practice test state."""
         st.session_state.practice_test_questions = []
         st.session_state.practice_test_answers = {}
         st.session_state.practice_test_evaluations = {}
+        st.session_state.practice_test_voice_inputs = {}
         st.session_state.practice_test_current_index = 0
         st.session_state.practice_test_completed = False
         st.rerun()
@@ -771,23 +1052,28 @@ class CompleteInterviewUI:
         if not answer or len(answer.strip()) < 10:
             return False
         
-        # Voice input indicators from config
-        voice_indicators = [
-            "um", "uh", "er", "ah", "you know", "like", "so", "well",
-            "I mean", "basically", "actually", "kind of", "sort of"
-        ]
-        
         # Check for voice-like characteristics
         words = answer.split()
         word_count = len(words)
-        filler_count = sum(1 for indicator in voice_indicators if indicator.lower() in answer.lower())
+        filler_count = len(_VOICE_FILLER_RE.findall(answer))
         
         # Heuristic: if answer has many filler words relative to length, likely voice
         filler_ratio = filler_count / max(word_count, 1)
         
-        # Also check for natural speech patterns
-        has_repetition = len(set(words)) < len(words) * 0.8  # Some word repetition
-        has_contractions = any(word for word in words if "'" in word)  # Natural contractions
+        # Also check for natural speech patterns: some word repetition,
+        # stopping as soon as more than 20% of the words are repeats
+        has_repetition = False
+        seen = set()
+        repeats = 0
+        for word in words:
+            if word in seen:
+                repeats += 1
+                if repeats > 0.2 * word_count:
+                    has_repetition = True
+                    break
+            else:
+                seen.add(word)
+        has_contractions = "'" in answer  # Natural contractions
         
         # Voice detection threshold
         return (filler_ratio > 0.02 or  # 2% filler words
@@ -796,16 +1082,22 @@ class CompleteInterviewUI:
     
     def _generate_performance_analysis(self):
         """Generate AI-powered performance analysis."""
+        ss = st.session_state
+        
+        # The analysis only depends on competencies and scores
+        key = tuple(zip(ss.eval_competencies, ss.eval_scores))
+        if ss.performance_analysis and ss.performance_analysis_key == key:
+            return
+        
         with st.spinner("🧠 Analyzing your performance..."):
             try:
-                loop = asyncio.new_event_loop()
-                asyncio.set_event_loop(loop)
-                analysis = loop.run_until_complete(
-                    st.session_state.interview_manager.analyze_performance(st.session_state.evaluation_results)
+                analysis = run_async(
+                    ss.interview_manager.analyze_performance(ss.evaluation_results)
                 )
-                st.session_state.performance_analysis = analysis
+                ss.performance_analysis = analysis
+                ss.performance_analysis_key = key
                 st.success("✅ Performance analysis completed!")
-                st.rerun()
+                st.rerun(scope="fragment")
                 
             except Exception as e:
                 st.error(f"Error generating analysis: {str(e)}")
@@ -827,19 +1119,13 @@ class CompleteInterviewUI:
         if analysis.get('competency_breakdown'):
             st.subheader("📊 Competency Breakdown")
             
-            breakdown_data = []
-            for comp, data in analysis['competency_breakdown'].items():
-                breakdown_data.append({
-                    'Competency': comp,
-                    'Average Score': data['average_score'],
-                    'Attempts': data['attempts'],
-                    'Latest Score': data['latest_score'],
-                    'Improvement': data.get('improvement', 0)
-                })
+            breakdown_rows = tuple(
+                (comp, data['average_score'], data['attempts'], data['latest_score'], data.get('improvement', 0))
+                for comp, data in analysis['competency_breakdown'].items()
+            )
             
-            if breakdown_data:
-                df = pd.DataFrame(breakdown_data)
-                st.dataframe(df, use_container_width=True)
+            if breakdown_rows:
+                st.dataframe(_breakdown_df(breakdown_rows), use_container_width=True)
         
         # Strengths and weaknesses
         col1, col2 = st.columns(2)
@@ -872,55 +1158,64 @@ class CompleteInterviewUI:
             else:
                 st.info("➡️ Your performance is stable")
     
-    def _generate_progress_report(self) -> Dict[str, Any]:
+    def _generate_progress_report(self, now: datetime) -> Dict[str, Any]:
         """Generate exportable progress report."""
-        voice_count = sum(1 for e in st.session_state.evaluation_results if e.get('was_voice_input', False))
-        text_count = len(st.session_state.evaluation_results) - voice_count
+        ss = st.session_state
+        voice_count = ss.voice_count
+        text_count = ss.text_score_count
         
         return {
-            "report_date": datetime.now().isoformat(),
+            "report_date": now.isoformat(),
             "candidate_info": {
                 "target_role": st.session_state.job_info.get('title', 'Unknown'),
                 "industry": st.session_state.job_info.get('industry', 'Unknown')
             },
             "performance_summary": {
-                "total_questions": len(st.session_state.evaluation_results),
-                "average_score": sum(e['score'] for e in st.session_state.evaluation_results) / len(st.session_state.evaluation_results) if st.session_state.evaluation_results else 0,
+                "total_questions": ss.score_count,
+                "average_score": ss.score_sum / ss.score_count if ss.score_count else 0,
                 "latest_score": st.session_state.evaluation_results[-1]['score'] if st.session_state.evaluation_results else 0,
                 "voice_answers": voice_count,
                 "text_answers": text_count,
                 "competency_breakdown": self._get_progress_summary()
             },
             "input_method_analysis": {
-                "voice_usage_percentage": (voice_count / len(st.session_state.evaluation_results) * 100) if st.session_state.evaluation_results else 0,
-                "voice_average_score": sum(e['score'] for e in st.session_state.evaluation_results if e.get('was_voice_input', False)) / max(voice_count, 1),
-                "text_average_score": sum(e['score'] for e in st.session_state.evaluation_results if not e.get('was_voice_input', False)) / max(text_count, 1)
+                "voice_usage_percentage": (voice_count / ss.score_count * 100) if ss.score_count else 0,
+                "voice_average_score": ss.voice_score_sum / max(voice_count, 1),
+                "text_average_score": ss.text_score_sum / max(text_count, 1)
             },
             "detailed_results": st.session_state.evaluation_results,
             "practice_test_history": {
                 "completed_tests": 1 if st.session_state.practice_test_completed else 0,
-                "total_practice_questions": len(st.session_state.evaluation_results)
+                "total_practice_questions": ss.score_count
             }
         }
     
-    def _generate_csv_export(self) -> str:
+    def _generate_csv_export(self, now: datetime) -> str:
         """Generate CSV export of results."""
-        df = pd.DataFrame([
-            {
-                'Date': datetime.now().strftime('%Y-%m-%d'),
-                'Question_ID': i+1,
-                'Competency': eval_data['competency'],
-                'Score': eval_data['score'],
-                'Input_Method': 'Voice' if eval_data.get('was_voice_input', False) else 'Text',
-                'Overall_Assessment': eval_data.get('overall_assessment', ''),
-                'Key_Strengths': '; '.join(eval_data.get('strengths', [])),
-                'Improvement_Areas': '; '.join(eval_data.get('improvements', []))
-            }
-            for i, eval_data in enumerate(st.session_state.evaluation_results)
+        ss = st.session_state
+        date = now.strftime('%Y-%m-%d')
+        
+        # Rows are written straight from the evaluations; no DataFrame copy
+        buf = io.StringIO()
+        writer = csv.writer(buf)
+        writer.writerow([
+            'Date', 'Question_ID', 'Competency', 'Score', 'Input_Method',
+            'Overall_Assessment', 'Key_Strengths', 'Improvement_Areas'
         ])
-        return df.to_csv(index=False)
+        for i, eval_data in enumerate(ss.evaluation_results):
+            writer.writerow([
+                date,
+                i+1,
+                eval_data['competency'],
+                eval_data['score'],
+                'Voice' if eval_data.get('was_voice_input', False) else 'Text',
+                eval_data.get('overall_assessment', ''),
+                '; '.join(eval_data.get('strengths', [])),
+                '; '.join(eval_data.get('improvements', []))
+            ])
+        return buf.getvalue()
     
-    def _generate_study_plan(self) -> Dict[str, Any]:
+    def _generate_study_plan(self, now: datetime) -> Dict[str, Any]:
         """Generate personalized study plan."""
         # Analyze weak areas
         competency_scores = self._get_progress_summary()
@@ -928,16 +1223,14 @@ class CompleteInterviewUI:
         strong_areas = [comp for comp, score in competency_scores.items() if score >= 7]
         
         # Voice vs text analysis
-        voice_scores = [e['score'] for e in st.session_state.evaluation_results if e.get('was_voice_input', False)]
-        text_scores = [e['score'] for e in st.session_state.evaluation_results if not e.get('was_voice_input', False)]
-        
-        voice_avg = sum(voice_scores) / len(voice_scores) if voice_scores else 0
-        text_avg = sum(text_scores) / len(text_scores) if text_scores else 0
+        ss = st.session_state
+        voice_avg = ss.voice_score_sum / ss.voice_count if ss.voice_count else 0
+        text_avg = ss.text_score_sum / ss.text_score_count if ss.text_score_count else 0
         
         preferred_method = "voice" if voice_avg > text_avg else "text" if text_avg > voice_avg else "both"
         
         return {
-            "study_plan_date": datetime.now().isoformat(),
+            "study_plan_date": now.isoformat(),
             "assessment": {
                 "strong_competencies": strong_areas,
                 "focus_competencies": weak_areas[:3],
@@ -1024,16 +1317,18 @@ We are a fast-growing technology company building cutting-edge AI/ML platforms f
     def _analyze_job_description(self, job_description: str):
         """Analyze job description and initialize interview manager."""
         with st.spinner("🔍 Analyzing job description..."):
-            # Initialize job analyzer
-            if not st.session_state.job_analyzer:
-                st.session_state.job_analyzer = JobAnalyzer()
-            
             # Analyze job
-            job_info = st.session_state.job_analyzer.analyze_job_description(job_description)
+            jd_sha = hashlib.sha256(job_description.encode()).hexdigest()
+            job_info = _cached_analyze(jd_sha, job_description)
+            if job_info.get('is_fallback'):
+                # A model error degraded this analysis; the cache is shared by
+                # every session, so drop it and let the next attempt retry
+                _cached_analyze.clear(jd_sha, job_description)
             st.session_state.job_info = job_info
         
         with st.spinner("🤖 Initializing AI interview coach with voice integration..."):
-            # Initialize interview manager
+            # Interview manager stays per session: it carries this candidate's
+            # progress and conversation, so it must not be shared
             st.session_state.interview_manager = InterviewManager(job_info)
         
         st.success("✅ Interview preparation system ready with voice & text input!")
@@ -1041,15 +1336,9 @@ We are a fast-growing technology company building cutting-edge AI/ML platforms f
     
     def _get_progress_summary(self) -> Dict[str, float]:
         """Get progress summary for sidebar and reports."""
-        summary = {}
-        for eval_data in st.session_state.evaluation_results:
-            competency = eval_data['competency']
-            if competency not in summary:
-                summary[competency] = []
-            summary[competency].append(eval_data['score'])
-        
-        # Calculate averages
-        return {comp: sum(scores) / len(scores) for comp, scores in summary.items()}
+        sums = st.session_state.comp_score_sums
+        counts = st.session_state.comp_score_counts
+        return {comp: sums[comp] / counts[comp] for comp in sums}
     
     def _get_score_class(self, score: float) -> str:
         """Get CSS class for score styling."""
@@ -1064,14 +1353,19 @@ We are a fast-growing technology company building cutting-edge AI/ML platforms f
     
     def _reset_application(self):
         """Reset the entire application state."""
-        for key in list(st.session_state.keys()):
-            del st.session_state[key]
+        stop_loop()
+        # initialize_session_state restores the defaults on the next run
+        st.session_state.clear()
         st.rerun()
 
 def main():
     """Main application entry point."""
     ui = CompleteInterviewUI()
     
+    # Streamlit drops elements that are not re-sent on a rerun, so the style
+    # block is emitted every run rather than guarded by session state.
+    st.markdown(_APP_CSS, unsafe_allow_html=True)
+    
     # Render UI components
     ui.render_header()
     ui.render_sidebar()
@@ -3,12 +3,88 @@ Streamlit Voice Integration with real ADK streaming.
 Implements WebRTC microphone access + LiveRequestQueue streaming.
 """
 import streamlit as st
+import streamlit.components.v1 as components
 import asyncio
-import json
 import base64
+import functools
+import html
+import itertools
+import os
 import time
-from typing import Dict, Any
-import streamlit.components.v1 as components
+from collections import deque
+from dataclasses import dataclass
+from typing import Dict, Any, List, Optional
+
+import av
+from streamlit_webrtc import WebRtcMode, webrtc_streamer
+
+from audio_handler import PCMResampler, decode_audio_to_pcm, frame_to_pcm
+from config import AUDIO_CONFIG
+from ui.session_loop import fmt_hms, get_loop, is_local_client, start_audio_sender
+
+# Event history kept per session, and how much of it a freshly mounted
+# event log starts with
+_VOICE_EVENT_LIMIT = 100
+_VOICE_EVENTS_VISIBLE = 20
+
+# Orders events so the event log can send only new ones; numbers are taken
+# as events enter the deque, on the thread that writes it
+_EVENT_SEQ = itertools.count(1)
+
+# Streaming events are handed to the UI in batches at this interval
+_EVENT_BATCH_INTERVAL = 0.1
+_EVENT_QUEUE_SIZE = 1024
+
+# How long the streaming status banner may reuse a previous lookup
+_STATUS_TTL = 1.0
+
+def _streaming_status(voice_agent) -> Dict[str, Any]:
+    """Return the agent's streaming status, memoized per session for a second."""
+    # Session state rather than st.cache_data: the status belongs to this
+    # user's agent and must not be shared between sessions.
+    now = time.monotonic()
+    cached = st.session_state.get('voice_status_cache')
+    if cached is not None and cached[0] is voice_agent and now - cached[1] < _STATUS_TTL:
+        return cached[2]
+    status = voice_agent.get_streaming_status()
+    st.session_state.voice_status_cache = (voice_agent, now, status)
+    return status
+
+# Live status banner shown while streaming
+_STATUS_BANNER = """
+<div style="background: linear-gradient(90deg, #28a745, #20c997); 
+            color: white; padding: 1rem; border-radius: 10px; 
+            text-align: center; animation: pulse 2s infinite;">
+    🎙️ <strong>SPEAK NOW - ADK IS LISTENING</strong><br>
+    <small>Model: {model} | Session Active: {active}</small>
+</div>
+"""
+
+# Implementation notes shown in the technical details expander
+_TECH_DETAILS_MD = """### How Real ADK Streaming Works:
+
+**1. LiveRequestQueue Pattern:**
+```python
+live_request_queue = LiveRequestQueue()
+run_config = RunConfig(response_modalities=["AUDIO"])
+live_events = runner.run_live(session, live_request_queue, run_config)
+```
+
+**2. Bidirectional Flow:**
+- Browser microphone → WebRTC → Streamlit → LiveRequestQueue
+- ADK processes audio with gemini-2.0-flash-live-001
+- live_events stream → Audio responses → Browser playback
+
+**3. Real-time Event Processing:**
+- Async generator processes events as they arrive
+- Text and audio responses handled separately
+- Continuous streaming without file uploads
+
+**4. Browser Integration:**
+- `streamlit-webrtc` media track for microphone access
+- Frames forwarded from the WebRTC worker to ADK as 16 kHz PCM
+- Event log appended in the browser; a fragment sends only new events
+"""
 
 def render_real_voice_streaming(self):
     """Render real-time voice streaming interface with ADK integration."""
@@ -24,9 +100,11 @@ def render_real_voice_streaming(self):
     if 'voice_streaming_active' not in st.session_state:
         st.session_state.voice_streaming_active = False
     if 'voice_events' not in st.session_state:
-        st.session_state.voice_events = []
+        st.session_state.voice_events = deque(maxlen=_VOICE_EVENT_LIMIT)
     if 'streaming_task' not in st.session_state:
         st.session_state.streaming_task = None
+    # A full run may have remounted the event log, so resend its visible tail
+    st.session_state.voice_log_seq = 0
     
     col1, col2 = st.columns([1, 1])
     
@@ -41,15 +119,11 @@ def render_real_voice_streaming(self):
             st.success("🟢 **LIVE STREAMING ACTIVE**")
             
             # Real-time status
-            status = st.session_state.interview_manager.voice_agent.get_streaming_status()
-            st.markdown(f"""
-            <div style="background: linear-gradient(90deg, #28a745, #20c997); 
-                        color: white; padding: 1rem; border-radius: 10px; 
-                        text-align: center; animation: pulse 2s infinite;">
-                🎙️ <strong>SPEAK NOW - ADK IS LISTENING</strong><br>
-                <small>Model: {status.get('model', 'Unknown')} | Session Active: {status.get('active', False)}</small>
-            </div>
-            """, unsafe_allow_html=True)
+            status = _streaming_status(st.session_state.interview_manager.voice_agent)
+            st.markdown(_STATUS_BANNER.format(
+                model=status.get('model', 'Unknown'),
+                active=status.get('active', False),
+            ), unsafe_allow_html=True)
             
             if st.button("⏹️ Stop Live Streaming", type="secondary", key="stop_real_streaming"):
                 self._stop_real_voice_streaming()
@@ -66,10 +140,12 @@ def render_real_voice_streaming(self):
             
             # Audio file test
             st.markdown("**Test with audio file:**")
+            # The key rotates after each send, which gives a fresh, empty
+            # uploader; the browser keeps re-sending a file under the old key
             uploaded_audio = st.file_uploader(
                 "Upload test audio:", 
                 type=['wav', 'mp3', 'm4a'], 
-                key="test_audio_upload"
+                key=f"test_audio_upload_{st.session_state.get('test_audio_upload_nonce', 0)}"
             )
             if uploaded_audio and st.button("🎵 Send Audio to Stream"):
                 self._send_audio_to_stream(uploaded_audio)
@@ -79,229 +155,243 @@ def render_real_voice_streaming(self):
         st.subheader("🌐 Browser Microphone")
         
         if st.session_state.voice_streaming_active:
-            # Embed WebRTC interface
-            self._render_webrtc_interface()
+            self._render_webrtc_audio_receiver()
         else:
             st.info("Start streaming to enable microphone access")
     
     with col2:
         st.subheader("💬 Live Event Stream")
         
-        # Real-time event display
-        event_container = st.container(height=500)
-        with event_container:
-            if st.session_state.voice_streaming_active:
-                # Display streaming events
-                events = st.session_state.voice_events[-20:]  # Last 20 events
-                
-                if not events:
-                    st.info("🎙️ Waiting for voice input...")
-                
-                for event in events:
-                    timestamp = time.strftime("%H:%M:%S", time.localtime(event.get('timestamp', time.time())))
-                    event_type = event.get('event_type', 'unknown')
-                    
-                    if event_type == 'text_response':
-                        st.markdown(f"""
-                        <div style="background: #e8f5e8; padding: 0.8rem; margin: 0.3rem 0; 
-                                    border-radius: 8px; border-left: 4px solid #28a745;">
-                            <strong>🤖 ADK Response:</strong> {event.get('content', '')}<br>
-                            <small style="color: #666;">[{timestamp}]</small>
-                        </div>
-                        """, unsafe_allow_html=True)
-                    
-                    elif event_type == 'audio_response':
-                        st.markdown(f"""
-                        <div style="background: #fff3e0; padding: 0.8rem; margin: 0.3rem 0; 
-                                    border-radius: 8px; border-left: 4px solid #ff9800;">
-                            <strong>🔊 Audio Response:</strong> Voice message received<br>
-                            <small style="color: #666;">[{timestamp}]</small>
-                        </div>
-                        """, unsafe_allow_html=True)
-                        
-                        # Audio playback
-                        if event.get('audio_data'):
-                            try:
-                                audio_bytes = base64.b64decode(event['audio_data'])
-                                st.audio(audio_bytes, format='audio/wav')
-                            except Exception as e:
-                                st.error(f"Audio playback error: {e}")
-                    
-                    elif event_type == 'user_input':
-                        st.markdown(f"""
-                        <div style="background: #e3f2fd; padding: 0.8rem; margin: 0.3rem 0; 
-                                    border-radius: 8px; border-left: 4px solid #2196f3;">
-                            <strong>🎙️ You:</strong> {event.get('content', 'Audio input')}<br>
-                            <small style="color: #666;">[{timestamp}]</small>
-                        </div>
-                        """, unsafe_allow_html=True)
-                    
-                    elif event.get('type') == 'error':
-                        st.error(f"❌ Error: {event.get('message', 'Unknown error')}")
-                
-                # Auto-refresh for real-time updates
-                if st.session_state.voice_streaming_active:
-                    time.sleep(0.1)  # Small delay
-                    st.rerun()
-            else:
-                st.info("🎙️ Start voice streaming to see live events here!")
+        self._render_voice_event_stream()
     
     # Technical details
     with st.expander("🔧 Real ADK Streaming Implementation"):
-        st.markdown("""
-        ### How Real ADK Streaming Works:
-        
-        **1. LiveRequestQueue Pattern:**
-        ```python
-        live_request_queue = LiveRequestQueue()
-        run_config = RunConfig(response_modalities=["AUDIO"])
-        live_events = runner.run_live(session, live_request_queue, run_config)
-        ```
-        
-        **2. Bidirectional Flow:**
-        - Browser microphone → WebRTC → Streamlit → LiveRequestQueue
-        - ADK processes audio with gemini-2.0-flash-live-001
-        - live_events stream → Audio responses → Browser playback
-        
-        **3. Real-time Event Processing:**
-        - Async generator processes events as they arrive
-        - Text and audio responses handled separately
-        - Continuous streaming without file uploads
-        
-        **4. Browser Integration:**
-        - WebRTC for microphone access
-        - Real-time audio streaming to backend
-        - Audio playback of responses
-        """)
-
-def _render_webrtc_interface(self):
-    """Render WebRTC interface for microphone access."""
-    webrtc_html = """
-    <div id="voice-interface" style="text-align: center; padding: 20px; border: 2px dashed #ccc; border-radius: 10px;">
-        <h4>🎙️ Live Microphone Interface</h4>
-        <button id="startRecord" style="background: #28a745; color: white; border: none; padding: 10px 20px; border-radius: 5px; margin: 5px;">
-            Start Recording
-        </button>
-        <button id="stopRecord" style="background: #dc3545; color: white; border: none; padding: 10px 20px; border-radius: 5px; margin: 5px;" disabled>
-            Stop Recording
-        </button>
-        <div id="status" style="margin-top: 10px; font-weight: bold;">Ready to record</div>
-        <div id="visualizer" style="margin-top: 10px; height: 50px; background: #f0f0f0; border-radius: 5px;"></div>
-    </div>
+        st.markdown(_TECH_DETAILS_MD)
+
+@dataclass(slots=True)
+class VoiceEvent:
+    """A streaming event as shown in the live event list."""
+    event_type: str
+    seq: int = 0
+    content_html: str = ""
+    ts_str: str = ""
+    audio_bytes: Optional[bytes] = None
+    audio_error: str = ""
+
+# Event list row templates, keyed by event type
+_EVENT_TEMPLATES = {
+    'text_response': (
+        '<div style="background: #e8f5e8; padding: 0.8rem; margin: 0.3rem 0; '
+        'border-radius: 8px; border-left: 4px solid #28a745;">'
+        '<strong>🤖 ADK Response:</strong> {content}<br>'
+        '<small style="color: #666;">[{ts}]</small></div>'
+    ),
+    'audio_response': (
+        '<div style="background: #fff3e0; padding: 0.8rem; margin: 0.3rem 0; '
+        'border-radius: 8px; border-left: 4px solid #ff9800;">'
+        '<strong>🔊 Audio Response:</strong> Voice message received<br>'
+        '<small style="color: #666;">[{ts}]</small></div>'
+    ),
+    'user_input': (
+        '<div style="background: #e3f2fd; padding: 0.8rem; margin: 0.3rem 0; '
+        'border-radius: 8px; border-left: 4px solid #2196f3;">'
+        '<strong>🎙️ You:</strong> {content}<br>'
+        '<small style="color: #666;">[{ts}]</small></div>'
+    ),
+    'error': (
+        '<div style="background: #ffebee; padding: 0.8rem; margin: 0.3rem 0; '
+        'border-radius: 8px; border-left: 4px solid #dc3545;">'
+        '<strong>❌ Error:</strong> {content}<br>'
+        '<small style="color: #666;">[{ts}]</small></div>'
+    ),
+}
+_EVENT_DEFAULT_CONTENT = {'user_input': 'Audio input', 'error': 'Unknown error'}
+_AUDIO_PLAYER = '<audio controls style="width: 100%;" src="data:audio/wav;base64,{data}"></audio>'
+
+# Event log component; a static page, so there is no frontend build step
+_voice_log = components.declare_component(
+    "voice_log", path=os.path.join(os.path.dirname(__file__), "voice_log")
+)
+
+def _render_event_row(event: VoiceEvent) -> str:
+    """Build the event log row for a text, user input or error event."""
+    return _EVENT_TEMPLATES[event.event_type].format(
+        ts=event.ts_str, content=event.content_html
+    )
+
+def _render_audio_row(event: VoiceEvent) -> str:
+    """Build the event log row for an audio response, with its player."""
+    row = _render_event_row(event)
+    # Audio goes out with its row once, so it is encoded once per event
+    if event.audio_bytes is not None:
+        row += _AUDIO_PLAYER.format(data=base64.b64encode(event.audio_bytes).decode('ascii'))
+    elif event.audio_error:
+        row += _EVENT_TEMPLATES['error'].format(
+            ts=event.ts_str,
+            content=html.escape(f"Audio playback error: {event.audio_error}", quote=False),
+        )
+    return row
+
+# Event log row builders, keyed by event type; other types are not shown
+_ROW_RENDERERS = {
+    'text_response': _render_event_row,
+    'audio_response': _render_audio_row,
+    'user_input': _render_event_row,
+    'error': _render_event_row,
+}
+
+# Polls at 2 Hz; only this fragment reruns, leaving the WebRTC component alone
+@st.fragment(run_every=0.5)
+def _render_voice_event_stream(self):
+    """Render the live ADK event list."""
+    ss = st.session_state
+    if not ss.voice_streaming_active:
+        st.info("🎙️ Start voice streaming to see live events here!")
+        return
     
-    <script>
-    let mediaRecorder;
-    let audioChunks = [];
-    let isRecording = false;
+    # The streaming loop thread writes the deque concurrently, so work from
+    # a snapshot (list() copies it in one step under the GIL).
+    snapshot = list(ss.voice_events)
     
-    const startBtn = document.getElementById('startRecord');
-    const stopBtn = document.getElementById('stopRecord');
-    const status = document.getElementById('status');
+    # Only events newer than the last one sent go to the browser; the log
+    # component appends them without touching rows already shown.
+    cursor = ss.get('voice_log_seq', 0)
+    if cursor:
+        new_events = [event for event in snapshot if event.seq > cursor]
+    else:
+        new_events = snapshot[-_VOICE_EVENTS_VISIBLE:]
     
-    startBtn.addEventListener('click', startRecording);
-    stopBtn.addEventListener('click', stopRecording);
+    rows = []
+    for event in new_events:
+        render = _ROW_RENDERERS.get(event.event_type)
+        if render is not None:
+            rows.append({'seq': event.seq, 'html': render(event)})
     
-    async function startRecording() {
-        try {
-            const stream = await navigator.mediaDevices.getUserMedia({ audio: true });
-            mediaRecorder = new MediaRecorder(stream, { mimeType: 'audio/webm;codecs=opus' });
-            audioChunks = [];
-            
-            mediaRecorder.ondataavailable = event => {
-                audioChunks.push(event.data);
-            };
-            
-            mediaRecorder.onstop = () => {
-                const audioBlob = new Blob(audioChunks, { type: 'audio/webm;codecs=opus' });
-                sendAudioToStreamlit(audioBlob);
-            };
-            
-            mediaRecorder.start(1000); // Collect data every 1 second
-            isRecording = true;
-            
-            startBtn.disabled = true;
-            stopBtn.disabled = false;
-            status.textContent = '🔴 Recording... Speak now!';
-            status.style.color = '#dc3545';
-            
-        } catch (error) {
-            console.error('Error accessing microphone:', error);
-            status.textContent = '❌ Microphone access denied';
-            status.style.color = '#dc3545';
-        }
-    }
+    _voice_log(
+        append=rows,
+        limit=_VOICE_EVENT_LIMIT,
+        key="voice_event_log",
+        default=None,
+    )
+    if new_events:
+        ss.voice_log_seq = new_events[-1].seq
+
+def _render_webrtc_audio_receiver(self):
+    """Capture the browser microphone with streamlit-webrtc and feed ADK."""
+    ss = st.session_state
+    voice_agent = ss.interview_manager.voice_agent
+    loop = get_loop()
     
-    function stopRecording() {
-        if (mediaRecorder && isRecording) {
-            mediaRecorder.stop();
-            mediaRecorder.stream.getTracks().forEach(track => track.stop());
-            isRecording = false;
-            
-            startBtn.disabled = false;
-            stopBtn.disabled = true;
-            status.textContent = '⏹️ Processing audio...';
-            status.style.color = '#007bff';
-        }
-    }
+    # Created once per session so filter state survives reruns; aiortc
+    # decodes Opus at 48 kHz and ADK expects 16 kHz input.
+    if 'voice_resampler' not in ss:
+        ss.voice_resampler = PCMResampler(48000, AUDIO_CONFIG["input"]["sample_rate"])
+    resampler = ss.voice_resampler
     
-    function sendAudioToStreamlit(audioBlob) {
-        // Convert blob to base64 and send to Streamlit
-        const reader = new FileReader();
-        reader.onloadend = function() {
-            const base64data = reader.result.split(',')[1];
-            
-            // Send to Streamlit via custom event
-            window.parent.postMessage({
-                type: 'audio_data',
-                data: base64data,
-                timestamp: Date.now()
-            }, '*');
-            
-            status.textContent = '✅ Audio sent to ADK!';
-            status.style.color = '#28a745';
-            
-            setTimeout(() => {
-                status.textContent = 'Ready to record';
-                status.style.color = '#000';
-            }, 2000);
-        };
-        reader.readAsDataURL(audioBlob);
-    }
+    # One sender per session and agent; frames must reach ADK in order
+    audio_sender = ss.get('voice_audio_sender')
+    if audio_sender is None or audio_sender[0] is not voice_agent or audio_sender[2].done():
+        audio_sender = ss.voice_audio_sender = (
+            voice_agent, *start_audio_sender(voice_agent, loop)
+        )
+    audio_queue = audio_sender[1]
+    
+    def audio_frame_callback(frame: av.AudioFrame) -> av.AudioFrame:
+        # Runs on the WebRTC worker thread; the frame is not sent back
+        loop.call_soon_threadsafe(audio_queue.put_nowait, frame_to_pcm(frame, resampler))
+        return frame
     
-    // Visual feedback
-    function updateVisualizer() {
-        // Simple audio visualizer could be added here
-        if (isRecording) {
-            const visualizer = document.getElementById('visualizer');
-            visualizer.style.background = `linear-gradient(90deg, 
-                hsl(${Math.random() * 120}, 70%, 50%) 0%, 
-                hsl(${Math.random() * 120}, 70%, 50%) 100%)`;
-        }
-    }
+    audio_constraints = {"channelCount": 1, "latency": 0}
+    if AUDIO_CONFIG["streaming"]["local_low_latency"] and is_local_client():
+        # On loopback there is no echo path to correct for, so browser
+        # processing and its buffering are pure delay.
+        audio_constraints.update(
+            echoCancellation=False,
+            noiseSuppression=False,
+            autoGainControl=False,
+        )
     
-    setInterval(updateVisualizer, 100);
-    </script>
-    """
+    # The aiortc worker owns the media track, so it survives reruns and no
+    # frames are dropped while the script re-executes.
+    webrtc_streamer(
+        key="adk-voice",
+        mode=WebRtcMode.SENDRECV,
+        media_stream_constraints={"video": False, "audio": audio_constraints},
+        audio_frame_callback=audio_frame_callback,
+        sendback_audio=False,
+        rtc_configuration={
+            "iceServers": [{"urls": AUDIO_CONFIG["streaming"]["stun_servers"]}]
+        },
+    )
+
+def _prepare_event(event: Dict[str, Any]) -> VoiceEvent:
+    """Convert an incoming event dict into a display-ready VoiceEvent."""
+    # Done once on ingest rather than on every render of the event list
+    event_type = event.get('event_type')
+    if event_type is None:
+        event_type = 'error' if event.get('type') == 'error' else 'unknown'
+    content_key = 'message' if event_type == 'error' else 'content'
+    prepared = VoiceEvent(
+        event_type=event_type,
+        content_html=html.escape(
+            event.get(content_key, _EVENT_DEFAULT_CONTENT.get(event_type, '')), quote=False
+        ),
+        ts_str=fmt_hms(int(event.get('timestamp', time.time()))),
+    )
     
-    components.html(webrtc_html, height=200)
+    # Keep an audio response's decoded bytes, not its base64 payload
+    if event_type == 'audio_response' and event.get('audio_data'):
+        try:
+            prepared.audio_bytes = base64.b64decode(event['audio_data'])
+        except ValueError as e:  # includes binascii.Error
+            prepared.audio_error = str(e)
+    return prepared
+
+def _add_events(voice_events, events: List[VoiceEvent]):
+    """Number events in insertion order and add them to the event deque."""
+    # Runs on the streaming loop thread, the deque's only writer, so the
+    # sequence numbers increase along the deque.
+    for event in events:
+        event.seq = next(_EVENT_SEQ)
+    # The deque drops the oldest events past its limit
+    voice_events.extend(events)
+
+async def _stream_voice_events(voice_agent, voice_events):
+    """Pump ADK streaming events into the session's event deque in batches."""
+    event_queue = asyncio.Queue(maxsize=_EVENT_QUEUE_SIZE)
+    
+    async def produce():
+        async for event in voice_agent.start_voice_streaming():
+            await event_queue.put(_prepare_event(event))
+    
+    producer = asyncio.create_task(produce())
+    try:
+        # Token-by-token bursts are coalesced into one extend per interval
+        # instead of touching the shared deque for every event.
+        while not (producer.done() and event_queue.empty()):
+            await asyncio.sleep(_EVENT_BATCH_INTERVAL)
+            batch = []
+            try:
+                while True:
+                    batch.append(event_queue.get_nowait())
+            except asyncio.QueueEmpty:
+                pass
+            if batch:
+                _add_events(voice_events, batch)
+        producer.result()
+    finally:
+        producer.cancel()
 
 def _start_real_voice_streaming(self):
     """Start real ADK voice streaming session."""
     try:
-        # Start streaming task
-        async def start_streaming():
-            voice_agent = st.session_state.interview_manager.voice_agent
-            
-            async for event in voice_agent.start_voice_streaming():
-                # Add event to session state
-                st.session_state.voice_events.append(event)
-                
-                # Limit event history
-                if len(st.session_state.voice_events) > 100:
-                    st.session_state.voice_events = st.session_state.voice_events[-50:]
+        voice_agent = st.session_state.interview_manager.voice_agent
+        voice_events = st.session_state.voice_events
         
-        # Run streaming in background
-        st.session_state.streaming_task = asyncio.create_task(start_streaming())
+        # Run streaming on the background loop so it outlives this rerun
+        st.session_state.streaming_task = asyncio.run_coroutine_threadsafe(
+            _stream_voice_events(voice_agent, voice_events), get_loop()
+        )
         st.session_state.voice_streaming_active = True
         
         st.success("🚀 Real-time voice streaming started!")
@@ -321,7 +411,12 @@ def _stop_real_voice_streaming(self):
         if st.session_state.streaming_task:
             st.session_state.streaming_task.cancel()
             st.session_state.streaming_task = None
-        
+
+        # Stop forwarding microphone audio
+        audio_sender = st.session_state.pop('voice_audio_sender', None)
+        if audio_sender is not None:
+            audio_sender[2].cancel()
+
         st.session_state.voice_streaming_active = False
         
         st.info("⏹️ Voice streaming stopped.")
@@ -330,22 +425,35 @@ def _stop_real_voice_streaming(self):
     except Exception as e:
         st.error(f"Error stopping voice streaming: {str(e)}")
 
+def _record_send(future, voice_events, content: str):
+    """Done-callback that logs a finished send into the event list."""
+    if future.cancelled():
+        return
+    error = future.exception()
+    if error is not None:
+        _add_events(voice_events, [_prepare_event({
+            'type': 'error',
+            'message': str(error),
+            'timestamp': time.time()
+        })])
+    elif future.result():
+        # Add user event
+        _add_events(voice_events, [_prepare_event({
+            'event_type': 'user_input',
+            'content': content,
+            'timestamp': time.time()
+        })])
+
 def _send_text_to_stream(self, text: str):
     """Send text to the live streaming session."""
     try:
-        async def send_text():
-            voice_agent = st.session_state.interview_manager.voice_agent
-            success = await voice_agent.send_text_to_stream(text)
-            
-            if success:
-                # Add user event
-                st.session_state.voice_events.append({
-                    'event_type': 'user_input',
-                    'content': text,
-                    'timestamp': time.time()
-                })
-        
-        asyncio.create_task(send_text())
+        voice_agent = st.session_state.interview_manager.voice_agent
+        future = asyncio.run_coroutine_threadsafe(
+            voice_agent.send_text_to_stream(text), get_loop()
+        )
+        future.add_done_callback(functools.partial(
+            _record_send, voice_events=st.session_state.voice_events, content=text
+        ))
         st.success(f"✅ Sent: {text}")
         
     except Exception as e:
@@ -354,22 +462,35 @@ def _send_text_to_stream(self, text: str):
 def _send_audio_to_stream(self, uploaded_audio):
     """Send uploaded audio to the live streaming session."""
     try:
-        audio_bytes = uploaded_audio.read()
+        # Keep only the bytes and name for the background send
+        audio_bytes = uploaded_audio.getvalue()
+        name = uploaded_audio.name
+        
+        voice_agent = st.session_state.interview_manager.voice_agent
+        sample_rate = AUDIO_CONFIG["input"]["sample_rate"]
         
         async def send_audio():
-            voice_agent = st.session_state.interview_manager.voice_agent
-            success = await voice_agent.send_audio_to_stream(audio_bytes, uploaded_audio.type)
-            
-            if success:
-                # Add user event
-                st.session_state.voice_events.append({
-                    'event_type': 'user_input',
-                    'content': f'Audio file: {uploaded_audio.name}',
-                    'timestamp': time.time()
-                })
+            # Decode once here, off both the script thread and the loop, so
+            # ADK gets raw PCM rather than an mp3/m4a container
+            pcm = await asyncio.get_running_loop().run_in_executor(
+                None, decode_audio_to_pcm, audio_bytes, sample_rate
+            )
+            return await voice_agent.send_audio_to_stream(
+                pcm, f"audio/pcm;rate={sample_rate}"
+            )
+        
+        future = asyncio.run_coroutine_threadsafe(send_audio(), get_loop())
+        future.add_done_callback(functools.partial(
+            _record_send,
+            voice_events=st.session_state.voice_events,
+            content=f'Audio file: {name}'
+        ))
         
-        asyncio.create_task(send_audio())
-        st.success(f"✅ Sent audio: {uploaded_audio.name}")
+        # Replace the uploader with an empty one on the next run
+        st.session_state.test_audio_upload_nonce = (
+            st.session_state.get('test_audio_upload_nonce', 0) + 1
+        )
+        st.success(f"✅ Sent audio: {name}")
         
     except Exception as e:
         st.error(f"Failed to send audio: {str(e)}")
@@ -378,7 +499,8 @@ def _send_audio_to_stream(self, uploaded_audio):
 def add_voice_streaming_methods(ui_class):
     """Add voice streaming methods to the UI class."""
     ui_class.render_real_voice_streaming = render_real_voice_streaming
-    ui_class._render_webrtc_interface = _render_webrtc_interface
+    ui_class._render_webrtc_audio_receiver = _render_webrtc_audio_receiver
+    ui_class._render_voice_event_stream = _render_voice_event_stream
     ui_class._start_real_voice_streaming = _start_real_voice_streaming
     ui_class._stop_real_voice_streaming = _stop_real_voice_streaming
     ui_class._send_text_to_stream = _send_text_to_stream